@@ -0,0 +1,319 @@
+"""Load test: a mix of API calls at fixed concurrency, against a local Postgres.
+
+Creates (or reuses) a benchmark database, loads sql/schema.sql, the migrations
+and the generate_data.py dataset sized by --scale, starts the API on it with
+uvicorn and drives a weighted mix of scenarios from --concurrency workers:
+
+    state       GET /api/state
+    export      GET /api/export/{orders,attendance,inventory-usage}, read to the end
+    order       PUT /api/orders/{id}, half new orders and half updates
+    clock_in    POST /api/attendance-logs
+    save_state  POST /api/state with the users, inventory, requests and the
+                recent orders and attendance a client holds
+
+Prints (or writes to --output) JSON with the throughput and p50/p95/p99
+latency of each scenario, so runs before and after a change can be compared.
+Never point it at a real database: --setup drops and recreates the target.
+
+    cd backend && python bench/load_test.py --setup --scale 1 --concurrency 16 --duration 30
+    cd backend && python bench/load_test.py --mix state=1 --concurrency 32 --output state.json
+    cd backend && python bench/load_test.py --url http://localhost:8000   # an already-running API
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import asyncpg
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_FILE = BACKEND_DIR.parent / "sql" / "schema.sql"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from generate_data import load_dataset  # noqa: E402
+from migrate import apply_migrations  # noqa: E402
+
+DEFAULT_DATABASE_URL = "postgresql://postgres@localhost:5432/sweetbox_bench"
+DEFAULT_MIX = "state=30,export=5,order=30,clock_in=30,save_state=5"
+EXPORTS = ("/api/export/orders", "/api/export/attendance", "/api/export/inventory-usage")
+
+# ========== DATABASE ==========
+
+async def setup_database(database_url, scale):
+    """Drop and recreate the benchmark database, then load schema, migrations and data"""
+    name = database_url.rsplit("/", 1)[1].split("?", 1)[0]
+    admin = await asyncpg.connect(database_url.rsplit("/", 1)[0] + "/postgres", ssl=False)
+    try:
+        await admin.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+        await admin.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        await admin.close()
+
+    conn = await asyncpg.connect(database_url, ssl=False)
+    try:
+        start = time.perf_counter()
+        await conn.execute(SCHEMA_FILE.read_text(encoding="utf-8"))
+        await apply_migrations(conn)
+        counts = await load_dataset(conn, scale)
+        print(f"Loaded scale {scale} in {time.perf_counter() - start:.1f}s: {counts}", file=sys.stderr)
+    finally:
+        await conn.close()
+
+
+# ========== SERVER ==========
+
+def start_server(database_url, port):
+    env = dict(os.environ, DATABASE_URL=database_url, DB_SSL="disable", LOG_LEVEL="WARNING")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+async def wait_until_healthy(client, server, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"API exited with status {server.returncode}")
+        try:
+            response = await client.get("/health")
+            if response.json().get("status") == "healthy":
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("API did not become healthy")
+
+
+# ========== SCENARIOS ==========
+
+def now_iso(offset=timedelta()):
+    return (datetime.now() + offset).isoformat(timespec="milliseconds")
+
+
+class Scenarios:
+    """The requests a worker can make; each returns the HTTP status"""
+
+    def __init__(self, client, snapshot, save_rows):
+        self.client = client
+        self.user_ids = [user["id"] for user in snapshot["users"]] or ["user-1"]
+        self.items = [item for item in snapshot["inventory"]][:200]
+        self.order_ids = [order["id"] for order in snapshot["orders"]]
+        self.save_payload = {
+            "users": snapshot["users"],
+            "inventory": snapshot["inventory"],
+            "requests": snapshot["requests"],
+            "orders": snapshot["orders"][:save_rows],
+            "attendanceLogs": snapshot["attendanceLogs"][:save_rows],
+        }
+
+    async def state(self, rng):
+        response = await self.client.get("/api/state")
+        return response.status_code
+
+    async def export(self, rng):
+        async with self.client.stream("GET", rng.choice(EXPORTS), params={"format": "ndjson"}) as response:
+            async for _ in response.aiter_bytes():
+                pass
+            return response.status_code
+
+    async def order(self, rng):
+        if self.order_ids and rng.random() < 0.5:
+            order_id = rng.choice(self.order_ids)
+        else:
+            order_id = f"bench-ord-{uuid.uuid4().hex[:12]}"
+        cart = [
+            {"id": item["id"], "name": item["name"], "unitPrice": float(item.get("cost") or 0),
+             "qty": rng.randint(1, 3), "source": "inventory"}
+            for item in rng.sample(self.items, min(len(self.items), rng.randint(1, 4)))
+        ]
+        order = {
+            "id": order_id,
+            "customer": f"Customer {rng.randint(1, 500)}",
+            "itemsJson": cart,
+            "total": round(sum(line["unitPrice"] * line["qty"] for line in cart), 2),
+            "type": rng.choice(("dine-in", "takeaway", "delivery")),
+            "timestamp": now_iso(),
+        }
+        response = await self.client.put(f"/api/orders/{order_id}", json=order)
+        return response.status_code
+
+    async def clock_in(self, rng):
+        log = {
+            "id": f"bench-att-{uuid.uuid4().hex[:12]}",
+            "employeeId": rng.choice(self.user_ids),
+            "action": rng.choice(("in", "out")),
+            "timestamp": now_iso(),
+            "shift": "day",
+        }
+        response = await self.client.post("/api/attendance-logs", json=log)
+        return response.status_code
+
+    async def save_state(self, rng):
+        response = await self.client.post("/api/state", json=self.save_payload)
+        return response.status_code
+
+
+# ========== DRIVER ==========
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if not hasattr(Scenarios, name) or name.startswith("_"):
+            raise SystemExit(f"Unknown scenario {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+async def worker(scenarios, mix, rng, deadline, record):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            status = await getattr(scenarios, name)(rng)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        record(name, time.perf_counter() - start, status)
+
+
+async def run_phase(scenarios, mix, concurrency, duration, seed):
+    samples = {name: [] for name in mix}
+    errors = {name: {} for name in mix}
+
+    def record(name, seconds, status):
+        samples[name].append(seconds)
+        if status != 200:
+            errors[name][str(status)] = errors[name].get(str(status), 0) + 1
+
+    deadline = time.monotonic() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(scenarios, mix, random.Random(seed * 1000 + i), deadline, record) for i in range(concurrency)
+    ))
+    return samples, errors, time.perf_counter() - start
+
+
+def summarize(samples, errors, elapsed):
+    endpoints = {}
+    for name, latencies in samples.items():
+        latencies.sort()
+        ms = lambda value: round(value * 1000, 2) if value is not None else None  # noqa: E731
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": sum(errors[name].values()),
+            "error_statuses": errors[name],
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "latency_ms": {
+                "p50": ms(percentile(latencies, 0.50)),
+                "p95": ms(percentile(latencies, 0.95)),
+                "p99": ms(percentile(latencies, 0.99)),
+                "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+                "max": ms(latencies[-1] if latencies else None),
+            },
+        }
+    total = sum(len(latencies) for latencies in samples.values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        "throughput_rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+async def run(args):
+    mix = parse_mix(args.mix)
+    if args.setup:
+        await setup_database(args.database_url, args.scale)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = start_server(args.database_url, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await wait_until_healthy(client, server)
+            snapshot = (await client.get("/api/state")).raise_for_status().json()
+            scenarios = Scenarios(client, snapshot, args.save_rows)
+            if args.warmup > 0:
+                await run_phase(scenarios, mix, args.concurrency, args.warmup, args.seed + 1)
+            samples, errors, elapsed = await run_phase(scenarios, mix, args.concurrency, args.duration, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    return {
+        "config": {
+            "url": base_url if args.url else None,
+            "scale": args.scale if args.setup else None,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "mix": mix,
+            "save_rows": args.save_rows,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        **summarize(samples, errors, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL),
+                        help="benchmark database (default: $BENCH_DATABASE_URL or %(default)s)")
+    parser.add_argument("--setup", action="store_true", help="drop, recreate and load the benchmark database first")
+    parser.add_argument("--scale", type=float, default=0.1,
+                        help="dataset size for --setup, as for generate_data.py (default: %(default)s)")
+    parser.add_argument("--url", help="drive an already-running API instead of starting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight,... (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before the run")
+    parser.add_argument("--save-rows", type=int, default=200,
+                        help="orders and attendance logs sent by each save_state")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Cold archive tier: move long-archived rows out of the live tables.
+
+Rows of users, inventory, attendance_logs, inventory_usage_logs and orders
+archived more than N days ago move to archive_<table> (migration 004), so the
+live tables and their indexes only hold what the app works with. Rows another
+row still refers to stay live. The API runs this daily
+(COLD_ARCHIVE_AFTER_DAYS, default 90). The archive page reads the cold rows
+from GET /api/archive/{type}; POST /api/{type}/bulk restores or deletes them.
+
+    cd backend && python cold_archive.py                # archived rows, live and cold, per table
+    cd backend && python cold_archive.py --days 90      # move rows archived more than 90 days ago
+"""
+import argparse
+import asyncio
+import os
+
+import asyncpg
+from dotenv import load_dotenv
+
+# A row stays live while any live or cold row refers to it, so restoring a cold
+# log or order never finds its user or item gone
+COLD_ARCHIVE_TABLES = ("attendance_logs", "orders", "inventory_usage_logs", "inventory", "users")
+
+
+async def has_cold_archive(conn):
+    """Whether migration 004 has run on this database"""
+    return await conn.fetchval("SELECT to_regproc('move_to_cold_archive') IS NOT NULL")
+
+
+async def move_archived_rows(conn, days, batch_size=5000):
+    """Move rows archived more than `days` days ago, in batches of `batch_size`
+    (one transaction each); returns {table: rows moved}"""
+    moved = {}
+    for table in COLD_ARCHIVE_TABLES:
+        moved[table] = 0
+        while True:
+            count = await conn.fetchval(
+                """SELECT move_to_cold_archive($1, (CURRENT_TIMESTAMP - make_interval(days => $2))::timestamp, $3)""",
+                table, days, batch_size
+            )
+            moved[table] += count
+            if count < batch_size:
+                break
+    return moved
+
+
+async def archive_counts(conn):
+    """(table, archived rows still live, rows in the cold archive) per table"""
+    counts = []
+    for table in COLD_ARCHIVE_TABLES:
+        live = await conn.fetchval(f"SELECT COUNT(*) FROM {table} WHERE archived IS TRUE")
+        cold = await conn.fetchval(f"SELECT COUNT(*) FROM archive_{table}")
+        counts.append((table, live, cold))
+    return counts
+
+
+async def run(args):
+    conn = await asyncpg.connect(os.environ["DATABASE_URL"], ssl=os.getenv("DB_SSL", "require"))
+    try:
+        if not await has_cold_archive(conn):
+            raise SystemExit("The cold archive tables do not exist yet; run migrate.py first")
+        if args.days is not None:
+            for table, count in (await move_archived_rows(conn, args.days, args.batch_size)).items():
+                print(f"{table:<22} moved {count:>8,}")
+        else:
+            print(f"{'table':<22} {'archived, live':>15} {'cold':>10}")
+            for table, live, cold in await archive_counts(conn):
+                print(f"{table:<22} {live:>15,} {cold:>10,}")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, help="move rows archived more than DAYS days ago")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows moved per transaction")
+    args = parser.parse_args()
+
+    load_dotenv()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
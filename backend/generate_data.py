@@ -0,0 +1,329 @@
+"""Generate a large, realistic synthetic dataset and bulk-load it with COPY.
+
+sql/seeds.sql has a handful of hand-written rows; this fills every table in
+sql/schema.sql with production-like volumes instead. At --scale 1:
+
+    users                   25 employees, hired over the last six years
+    attendance_logs         a clock-in and clock-out per working day (~30k)
+    inventory               150 items across the shop's categories
+    inventory_usage_logs    ~40 usage entries a day (~29k)
+    orders                  ~200 a day with 1-4 cart lines each (~146k)
+    requests                leave and profile-edit requests (~350)
+    inventory_trends        total usage per item
+    sales_history(_hourly)  derived from the orders by the rollup triggers
+
+over --days of history (default 730) ending at --as-of. Volumes scale
+linearly with --scale (fractions allowed). The same scale, days, seed and
+as-of always produce the same rows.
+
+The tables are truncated first, so the target must be a development or
+benchmark database; --replace is required when it already holds data.
+
+    cd backend && python generate_data.py --scale 1
+    cd backend && python generate_data.py --scale 10 --days 1095 --replace --database-url postgresql://...
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+
+import asyncpg
+from dotenv import load_dotenv
+
+from cold_archive import COLD_ARCHIVE_TABLES, has_cold_archive
+from partitions import create_partitions, is_partitioned
+
+USERS_PER_SCALE = 25
+ITEMS_PER_SCALE = 150
+ORDERS_PER_DAY = 200
+USAGE_LOGS_PER_DAY = 40
+
+LOADED_TABLES = (
+    "users", "attendance_logs", "requests", "inventory", "inventory_usage_logs", "orders",
+    "inventory_trends", "sales_history", "sales_history_hourly", "deleted_rows",
+)
+
+# role -> (permission, shift start, share of staff)
+ROLES = {
+    "manager": ("admin", None, 1),
+    "cashier": ("front_staff", dt_time(9, 0), 4),
+    "baker": ("kitchen_staff", dt_time(6, 0), 4),
+    "barista": ("kitchen_staff", dt_time(7, 0), 4),
+    "cook": ("kitchen_staff", dt_time(5, 30), 3),
+    "delivery_staff": ("delivery_staff", dt_time(10, 0), 2),
+}
+FIRST_NAMES = ("Maria", "Juan", "Sofia", "Luis", "Anne", "Carmen", "Pedro", "Elena", "Jose", "Ana", "Miguel",
+               "Rosa", "Carlos", "Liza", "Ramon", "Grace", "Paolo", "Bea", "Marco", "Ines")
+LAST_NAMES = ("Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Navarro", "Lopez", "Gonzales",
+              "Ramos", "Aquino", "Torres", "Flores", "Morales", "Castillo", "Villanueva")
+
+# category -> [(name, unit, cost, typical stock)]
+PRODUCTS = {
+    "cakes & pastries": [
+        ("Chocolate Mousse Slice", "slices", 120, 15), ("Classic Cheesecake (whole)", "whole", 850, 3),
+        ("Butter Croissant", "pieces", 35, 30), ("Almond Danish", "pieces", 45, 12),
+        ("Red Velvet Slice", "slices", 110, 12), ("Cinnamon Roll", "pieces", 50, 20),
+        ("Assorted Macarons (box of 6)", "box", 220, 6), ("Blueberry Muffin", "pieces", 55, 24),
+        ("Strawberry Shortcake (whole)", "whole", 780, 4), ("Chocolate Chip Cookie", "pieces", 25, 45),
+        ("Ensaymada", "pieces", 40, 30), ("Ube Cheese Pandesal", "pieces", 20, 60),
+    ],
+    "beverages": [
+        ("Bottled Water 500ml", "bottles", 15, 40), ("Iced Tea 350ml", "bottles", 45, 36),
+        ("Canned Soda 330ml", "cans", 30, 42), ("Orange Juice 250ml", "bottles", 40, 30),
+        ("Canned Coffee 240ml", "cans", 55, 24), ("Fresh Milk 1L", "cartons", 95, 12),
+    ],
+    "ingredients": [
+        ("All-purpose Flour", "kg", 40, 25), ("Granulated Sugar", "kg", 35, 20), ("Unsalted Butter", "kg", 180, 8),
+        ("Eggs", "trays", 210, 10), ("Cream Cheese", "kg", 420, 5), ("Cocoa Powder", "kg", 350, 4),
+        ("Vanilla Extract", "bottles", 250, 6), ("Whipping Cream", "liters", 230, 10),
+        ("Espresso Beans", "kg", 900, 5), ("Baking Powder", "kg", 160, 3),
+    ],
+}
+CUSTOMERS = ("Walk-in Customer",) * 6 + tuple(f"{first} {last}" for first in FIRST_NAMES[:8] for last in LAST_NAMES[:4])
+ORDER_TYPES = ("dine-in", "takeaway", "delivery", "pickup")
+ORDER_TYPE_WEIGHTS = (45, 35, 12, 8)
+# Share of a day's orders placed in each hour the shop is open, 07:00-21:00
+ORDER_HOURS = tuple(range(7, 22))
+ORDER_HOUR_WEIGHTS = (6, 9, 7, 5, 7, 10, 9, 6, 7, 8, 6, 5, 4, 3, 2)
+USAGE_REASONS = ("order", "production", "waste", "spoilage", "staff_consumption", "testing", "other")
+USAGE_REASON_WEIGHTS = (50, 25, 8, 6, 6, 3, 2)
+LEAVE_REASONS = ("Family event", "Medical appointment", "Vacation", "Personal errand", "Sick leave")
+
+
+def weighted(values, weights):
+    """`values` repeated by weight, for fast weighted rng.choice()"""
+    return tuple(value for value, weight in zip(values, weights) for _ in range(weight))
+
+
+def money(value):
+    return Decimal(value).quantize(Decimal("0.01"))
+
+
+class Dataset:
+    """Row generators for each table, driven by one seeded RNG"""
+
+    def __init__(self, scale, days, seed, as_of):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.as_of = as_of
+        self.first_day = as_of - timedelta(days=days - 1)
+        self.n_users = max(2, round(USERS_PER_SCALE * scale))
+        self.n_items = max(1, round(ITEMS_PER_SCALE * scale))
+        self.orders_per_day = ORDERS_PER_DAY * scale
+        self.usage_per_day = USAGE_LOGS_PER_DAY * scale
+        self.users = []
+        self.items = []
+        self.used = {}
+
+    def day_stamp(self, day, hour, minute=0):
+        return datetime.combine(day, dt_time(hour, minute)) + timedelta(seconds=self.rng.randrange(60))
+
+    def user_rows(self):
+        rng = self.rng
+        roles = list(ROLES)
+        weights = [ROLES[role][2] for role in roles]
+        for i in range(1, self.n_users + 1):
+            role = "manager" if i <= max(1, self.n_users // 12) else rng.choices(roles, weights)[0]
+            permission, shift_start, _ = ROLES[role]
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            hire_date = self.as_of - timedelta(days=rng.randrange(30, 6 * 365))
+            status = "inactive" if rng.random() < 0.05 else "active"
+            self.users.append((f"user-{i}", role, shift_start, hire_date, status))
+            yield (f"user-{i}", f"{first} {last}", f"{first.lower()}.{last.lower()}{i}@sweetbox.com", f"pass{i:04d}",
+                   f"09{rng.randrange(10, 100)} {rng.randrange(1000):03d} {rng.randrange(10000):04d}", role,
+                   permission, shift_start, hire_date, status, False, False, None, None,
+                   datetime.combine(hire_date, dt_time(9, 0)))
+
+    def attendance_rows(self):
+        rng = self.rng
+        for user_id, role, shift_start, hire_date, status in self.users:
+            if shift_start is None:
+                shift_start = dt_time(8, 0)
+            rest_day = rng.randrange(7)
+            start = max(self.first_day, hire_date)
+            for offset in range((self.as_of - start).days + 1):
+                day = start + timedelta(days=offset)
+                if day.weekday() == rest_day or rng.random() < 0.03:
+                    continue
+                clock_in = datetime.combine(day, shift_start) + timedelta(minutes=rng.gauss(-5, 8))
+                clock_out = clock_in + timedelta(hours=8, minutes=rng.gauss(15, 20))
+                shift = "morning" if shift_start.hour < 8 else "day"
+                stamp = f"{day:%Y%m%d}"
+                yield (f"att-{user_id}-{stamp}-in", user_id, "in", clock_in, shift, None, False, None, None)
+                if day < self.as_of:
+                    yield (f"att-{user_id}-{stamp}-out", user_id, "out", clock_out, shift, None, False, None, None)
+
+    def inventory_rows(self):
+        rng = self.rng
+        catalog = [(category, *product) for category, products in PRODUCTS.items() for product in products]
+        for i in range(self.n_items):
+            category, name, unit, cost, stock = catalog[i % len(catalog)]
+            if i >= len(catalog):
+                name = f"{name} ({i // len(catalog) + 1})"
+            restocked = self.as_of - timedelta(days=rng.randrange(14))
+            shelf_life = 4 if category == "cakes & pastries" else 120 if category == "beverages" else 60
+            item_id = f"inv-{i + 1}"
+            self.items.append((item_id, name, money(cost)))
+            yield (item_id, category, name, money(stock * rng.uniform(0.2, 1.5)), unit, money(cost), restocked,
+                   restocked + timedelta(days=shelf_life), None, money(max(2, stock // 3)), restocked, money(0),
+                   False, None, None, datetime.combine(self.first_day, dt_time(8, 0)))
+
+    def usage_rows(self):
+        rng = self.rng
+        staff = [user[0] for user in self.users]
+        for offset in range(self.days):
+            day = self.first_day + timedelta(days=offset)
+            for _ in range(self.poisson(self.usage_per_day)):
+                item_id, name, _ = rng.choice(self.items)
+                quantity = money(rng.choice((1, 1, 1, 2, 2, 3, 5)))
+                self.used[name] = self.used.get(name, 0) + int(quantity)
+                yield (item_id, quantity, rng.choices(USAGE_REASONS, USAGE_REASON_WEIGHTS)[0], None, None,
+                       rng.choice(staff), self.day_stamp(day, rng.choice(ORDER_HOURS), rng.randrange(60)),
+                       False, None, None)
+
+    def order_rows(self):
+        rng = self.rng
+        admins = [user[0] for user in self.users if user[1] == "manager"]
+        # Cart lines are pre-encoded per item: a JSON object that only needs its qty
+        lines = [(json.dumps({"id": item_id, "name": name, "unitPrice": float(cost), "qty": 0,
+                              "source": "inventory"}).split('"qty": 0'), int(cost * 100))
+                 for item_id, name, cost in self.items]
+        hours = weighted(ORDER_HOURS, ORDER_HOUR_WEIGHTS)
+        types = weighted(ORDER_TYPES, ORDER_TYPE_WEIGHTS)
+        for offset in range(self.days):
+            day = self.first_day + timedelta(days=offset)
+            midnight = datetime.combine(day, dt_time(0))
+            busy = 1.3 if day.weekday() >= 5 else 1.0
+            for n in range(1, self.poisson(self.orders_per_day * busy) + 1):
+                parts = []
+                cents = 0
+                for (head, tail), price in rng.sample(lines, min(len(lines), rng.choice((1, 1, 2, 2, 3, 4)))):
+                    qty = rng.choice((1, 1, 1, 2, 3))
+                    parts.append(f'{head}"qty": {qty}{tail}')
+                    cents += price * qty
+                stamp = midnight + timedelta(seconds=rng.choice(hours) * 3600 + rng.randrange(3600))
+                archived = rng.random() < 0.01
+                yield (f"ord-{day:%Y%m%d}-{n}", rng.choice(CUSTOMERS), f"[{', '.join(parts)}]",
+                       Decimal(cents).scaleb(-2), rng.choice(types), archived,
+                       stamp + timedelta(days=1) if archived else None,
+                       rng.choice(admins) if archived else None, stamp)
+
+    def request_rows(self):
+        rng = self.rng
+        admins = [user[0] for user in self.users if user[1] == "manager"]
+        years = self.days / 365
+        for user_id, role, shift_start, hire_date, status in self.users:
+            for n in range(self.poisson(7 * years)):
+                requested = datetime.combine(self.first_day, dt_time(10, 0)) + timedelta(
+                    days=rng.randrange(self.days), minutes=rng.randrange(480))
+                reviewed = requested.date() < self.as_of - timedelta(days=3)
+                reviewer = rng.choice(admins) if reviewed else None
+                review_time = requested + timedelta(hours=rng.randrange(2, 48)) if reviewed else None
+                if rng.random() < 0.85:
+                    start = requested.date() + timedelta(days=rng.randrange(3, 30))
+                    status = rng.choices(("approved", "rejected"), (8, 2))[0] if reviewed else "pending"
+                    yield (f"leave-{user_id}-{n}", user_id, "leave", start, start + timedelta(days=rng.randrange(3)),
+                           rng.choice(LEAVE_REASONS), None, status, requested, reviewer, review_time, None)
+                else:
+                    changes = {"phone": f"09{rng.randrange(10, 100)} {rng.randrange(1000):03d} {rng.randrange(10000):04d}"}
+                    status = "approved" if reviewed else "pending"
+                    yield (f"req-{user_id}-{n}", user_id, "profile_edit", None, None, None, json.dumps(changes),
+                           status, requested, reviewer, review_time, None)
+
+    def trend_rows(self):
+        for name, used in sorted(self.used.items()):
+            yield (name, used)
+
+    def poisson(self, mean):
+        """Poisson-ish count around `mean` (normal approximation, never negative)"""
+        if mean <= 0:
+            return 0
+        return max(0, round(self.rng.gauss(mean, mean ** 0.5)))
+
+
+# (table, columns, Dataset method); order matters for foreign keys and for
+# which rows a later table refers to
+TABLES = (
+    ("users", ("id", "name", "email", "password", "phone", "role", "permission", "shift_start", "hire_date", "status",
+               "require_password_reset", "archived", "archived_at", "archived_by", "created_at"), "user_rows"),
+    ("attendance_logs", ("id", "employee_id", "action", "timestamp", "shift", "note", "archived", "archived_at",
+                         "archived_by"), "attendance_rows"),
+    ("inventory", ("id", "category", "name", "quantity", "unit", "cost", "date_purchased", "use_by_date",
+                   "expiry_date", "reorder_point", "last_restocked", "total_used", "archived", "archived_at",
+                   "archived_by", "created_at"), "inventory_rows"),
+    ("inventory_usage_logs", ("inventory_item_id", "quantity", "reason", "batch_id", "notes", "created_by",
+                              "created_at", "archived", "archived_at", "archived_by"), "usage_rows"),
+    ("orders", ("id", "customer", "items_json", "total", "type", "archived", "archived_at", "archived_by",
+                "timestamp"), "order_rows"),
+    ("requests", ("id", "employee_id", "request_type", "start_date", "end_date", "reason", "requested_changes",
+                  "status", "requested_at", "reviewed_by", "reviewed_at", "review_note"), "request_rows"),
+    ("inventory_trends", ("label", "used"), "trend_rows"),
+)
+
+
+async def load_dataset(conn, scale=1, days=730, seed=42, as_of=None):
+    """Replace the contents of every application table with a generated dataset;
+    returns {table: rows loaded}"""
+    dataset = Dataset(scale, days, seed, as_of or date.today())
+    counts = {}
+    async with conn.transaction():
+        await conn.execute(f"TRUNCATE {', '.join(LOADED_TABLES)} RESTART IDENTITY CASCADE")
+        if await has_cold_archive(conn):
+            await conn.execute(f"TRUNCATE {', '.join('archive_' + t for t in COLD_ARCHIVE_TABLES)}")
+        if await is_partitioned(conn):
+            # Otherwise every month before the migration ran lands in the default partitions
+            await create_partitions(conn, dataset.first_day, dataset.as_of)
+        for table, columns, method in TABLES:
+            result = await conn.copy_records_to_table(table, records=getattr(dataset, method)(), columns=columns)
+            counts[table] = int(result.split()[-1])
+        # Stock used so far, matching the usage logs
+        await conn.execute(
+            """UPDATE inventory i SET total_used = u.used
+               FROM (SELECT inventory_item_id, SUM(quantity) AS used FROM inventory_usage_logs
+                     GROUP BY inventory_item_id) AS u
+               WHERE u.inventory_item_id = i.id"""
+        )
+    await conn.execute("ANALYZE")
+    return counts
+
+
+async def has_data(conn):
+    return await conn.fetchval("SELECT EXISTS (SELECT 1 FROM users) OR EXISTS (SELECT 1 FROM orders)")
+
+
+async def run(args):
+    conn = await asyncpg.connect(args.database_url, ssl=os.getenv("DB_SSL", "require"))
+    try:
+        if not args.replace and await has_data(conn):
+            raise SystemExit("The database already has data; pass --replace to truncate it and load the dataset")
+        start = time.perf_counter()
+        counts = await load_dataset(conn, args.scale, args.days, args.seed, args.as_of)
+        elapsed = time.perf_counter() - start
+        for table, count in counts.items():
+            print(f"{table:<22} {count:>10,}")
+        print(f"Loaded {sum(counts.values()):,} rows in {elapsed:.1f}s")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1, help="volume multiplier (default: %(default)s)")
+    parser.add_argument("--days", type=int, default=730, help="days of history (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, help="last day of history (default: today)")
+    parser.add_argument("--database-url", help="target database (default: $DATABASE_URL)")
+    parser.add_argument("--replace", action="store_true", help="truncate tables that already hold data")
+    args = parser.parse_args()
+
+    load_dotenv()
+    args.database_url = args.database_url or os.environ["DATABASE_URL"]
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
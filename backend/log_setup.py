@@ -0,0 +1,143 @@
+"""Logging for the API: level from LOG_LEVEL, output written off the event loop.
+
+configure_logging() puts one QueueHandler on the root logger, so a log call on
+the event loop only formats the record and enqueues it; a QueueListener thread
+writes it out. On the way in:
+
+- values of password/token/secret-like keys are replaced with *** in dict
+  arguments and in the message text
+- records logged with extra=SAMPLED are kept only once per LOG_SAMPLE_EVERY
+  for each route and message, for lines that would otherwise repeat on every
+  request of a busy read endpoint
+- when the queue is full (LOG_QUEUE_SIZE) records are dropped and counted
+  instead of blocking the caller
+"""
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+REDACTED = "***"
+SENSITIVE_KEYS = frozenset({"password", "passwd", "token", "secret", "authorization", "api_key", "apikey"})
+SENSITIVE_TEXT = re.compile(
+    r"""(['"]?(?:password|passwd|token|secret|authorization|api_key|apikey)['"]?\s*[:=]\s*)(['"])(.*?)\2""",
+    re.IGNORECASE,
+)
+
+# Pass as `extra` to mark a high-volume record for sampling
+SAMPLED = {"sampled": True}
+
+# The ASGI scope of the request being handled, set by the API's middleware;
+# sampling is per route
+current_scope = contextvars.ContextVar("current_scope", default=None)
+
+_listener = None
+_queue_handler = None
+
+
+def redact(value, depth=0):
+    """Copy of `value` with sensitive dict values masked, a few levels deep"""
+    if depth > 4:
+        return value
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if isinstance(key, str) and key.lower() in SENSITIVE_KEYS and item is not None
+            else redact(item, depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(item, depth + 1) for item in value)
+    return value
+
+
+def redact_text(text):
+    return SENSITIVE_TEXT.sub(lambda m: f"{m.group(1)}{m.group(2)}{REDACTED}{m.group(2)}", text)
+
+
+def current_route():
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return route.path if route is not None else scope.get("path")
+
+
+class SamplingFilter(logging.Filter):
+    """Keep the 1st, (N+1)th, (2N+1)th... SAMPLED record per route and message"""
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = every
+        self.seen = {}
+
+    def filter(self, record):
+        if self.every <= 1 or not getattr(record, "sampled", False):
+            return True
+        key = (current_route(), record.name, record.msg)
+        count = self.seen.get(key, 0)
+        self.seen[key] = count + 1
+        if count % self.every:
+            return False
+        if count:
+            record.msg = f"{record.msg} [1 in {self.every}]"
+        return True
+
+
+class RedactingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that masks secrets and drops records rather than block"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        if record.args:
+            record.args = redact(record.args)
+        record = super().prepare(record)
+        record.msg = record.message = redact_text(record.msg)
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging():
+    """Route all logging (including uvicorn's) through the background writer"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _queue_handler
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(logging.Formatter(os.getenv("LOG_FORMAT", LOG_FORMAT)))
+    log_queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    _queue_handler = RedactingQueueHandler(log_queue)
+    _queue_handler.addFilter(SamplingFilter(int(os.getenv("LOG_SAMPLE_EVERY", "100"))))
+
+    root = logging.getLogger()
+    root.handlers[:] = [_queue_handler]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    # uvicorn installs its own synchronous handlers before importing the app
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _queue_handler
+
+
+def stop_logging():
+    """Flush what is queued and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
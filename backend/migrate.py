@@ -0,0 +1,131 @@
+"""Versioned schema migrations.
+
+Applies the numbered SQL files in sql/migrations (NNN_description.sql) that
+have not run yet, in version order, each in its own transaction, and records
+them in schema_migrations. A Postgres advisory lock keeps two app instances
+starting at the same time from applying the same migration twice.
+
+sql/schema.sql still creates a fresh database; migrations change it from there.
+The API runs pending migrations on startup unless DB_MIGRATE_ON_STARTUP=false.
+
+    cd backend && python migrate.py            # apply pending migrations
+    cd backend && python migrate.py --status   # list applied and pending migrations
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from pathlib import Path
+
+import asyncpg
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "sql" / "migrations"
+MIGRATION_FILE = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+MIGRATION_LOCK_KEY = 731042  # any constant, as long as every instance of the app uses the same one
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """(version, name, sql, checksum) for every migration file, in version order"""
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = MIGRATION_FILE.match(path.name)
+        if not match:
+            logger.warning("Skipping %s: migration files are named NNN_description.sql", path.name)
+            continue
+        sql = path.read_text(encoding="utf-8")
+        checksum = hashlib.sha256(sql.encode()).hexdigest()
+        migrations.append((int(match.group(1)), match.group(2), sql, checksum))
+    migrations.sort()
+    versions = [version for version, *_ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+async def ensure_migrations_table(conn):
+    await conn.execute(
+        """CREATE TABLE IF NOT EXISTS schema_migrations (
+               version INT NOT NULL PRIMARY KEY,
+               name VARCHAR(255) NOT NULL,
+               checksum CHAR(64) NOT NULL,
+               applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+           )"""
+    )
+
+
+async def applied_migrations(conn):
+    rows = await conn.fetch("SELECT version, checksum FROM schema_migrations")
+    return {row["version"]: row["checksum"] for row in rows}
+
+
+async def apply_migrations(conn):
+    """Apply every pending migration on `conn`; returns the versions applied"""
+    await ensure_migrations_table(conn)
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+    try:
+        # Read after taking the lock, so migrations another instance just
+        # applied are seen as done
+        applied = await applied_migrations(conn)
+        done = []
+        for version, name, sql, checksum in discover_migrations():
+            if version in applied:
+                if applied[version] != checksum:
+                    logger.warning("Migration %03d_%s changed after it was applied", version, name)
+                continue
+            logger.info("Applying migration %03d_%s", version, name)
+            async with conn.transaction():
+                await conn.execute(sql)
+                await conn.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES ($1, $2, $3)",
+                    version, name, checksum
+                )
+            done.append(version)
+        if done:
+            logger.info("Applied %s migration(s); schema is at version %s", len(done), done[-1])
+        return done
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+
+
+async def print_status(conn):
+    await ensure_migrations_table(conn)
+    applied = await applied_migrations(conn)
+    for version, name, _, checksum in discover_migrations():
+        if version not in applied:
+            state = "pending"
+        elif applied[version] != checksum:
+            state = "applied (file changed since)"
+        else:
+            state = "applied"
+        print(f"{version:03d}_{name:<40} {state}")
+
+
+async def run(status_only):
+    conn = await asyncpg.connect(os.environ["DATABASE_URL"], ssl=os.getenv("DB_SSL", "require"))
+    try:
+        if status_only:
+            await print_status(conn)
+        else:
+            done = await apply_migrations(conn)
+            print(f"Applied {len(done)} migration(s)" if done else "Schema is up to date")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--status", action="store_true", help="list migrations instead of applying them")
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(run(args.status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Monthly partitions of attendance_logs and orders.
+
+Migration 003 partitions both tables by month on timestamp. Rows for a month
+with no partition yet land in <table>_default, so the coming months are
+created ahead of time: the API does this at startup and then daily
+(PARTITION_MONTHS_AHEAD, default 3). Old months can be detached. A detached
+month is a plain table again (orders_2024_01, ...) that no query on the parent
+reads; dump or drop it when it is no longer needed.
+
+    cd backend && python partitions.py                          # list partitions
+    cd backend && python partitions.py --ahead 6                # create months through 6 months from now
+    cd backend && python partitions.py --detach-before 2024-01  # detach months before January 2024
+"""
+import argparse
+import asyncio
+import os
+from datetime import date
+
+import asyncpg
+from dotenv import load_dotenv
+
+PARTITIONED_TABLES = ("attendance_logs", "orders")
+
+
+async def is_partitioned(conn):
+    """Whether migration 003 has run on this database"""
+    return await conn.fetchval("SELECT to_regproc('create_month_partitions') IS NOT NULL")
+
+
+async def create_partitions(conn, from_month, to_month):
+    """Create the missing monthly partitions in [from_month, to_month]; returns how many were created"""
+    created = 0
+    for table in PARTITIONED_TABLES:
+        created += await conn.fetchval("SELECT create_month_partitions($1, $2, $3)", table, from_month, to_month)
+    return created
+
+
+async def ensure_partitions(conn, months_ahead):
+    """Create partitions from this month through `months_ahead` months from now"""
+    from_month, to_month = await conn.fetchrow(
+        "SELECT CURRENT_DATE, (CURRENT_DATE + make_interval(months => $1))::date", months_ahead
+    )
+    return await create_partitions(conn, from_month, to_month)
+
+
+async def detach_partitions(conn, before_month):
+    """Detach the partitions for months before `before_month`; returns the detached table names"""
+    detached = []
+    for table in PARTITIONED_TABLES:
+        rows = await conn.fetch("SELECT detach_month_partitions($1, $2)", table, before_month)
+        detached += [row[0] for row in rows]
+    return detached
+
+
+async def list_partitions(conn):
+    """(table, partition, bounds, estimated rows, size in bytes) for every partition"""
+    return await conn.fetch(
+        """SELECT p.relname AS table, c.relname AS partition,
+                  pg_get_expr(c.relpartbound, c.oid) AS bounds,
+                  GREATEST(c.reltuples, 0)::bigint AS rows,
+                  pg_total_relation_size(c.oid) AS bytes
+           FROM pg_inherits i
+           JOIN pg_class c ON c.oid = i.inhrelid
+           JOIN pg_class p ON p.oid = i.inhparent
+           WHERE p.relname = ANY($1::text[])
+           ORDER BY p.relname, c.relname""",
+        list(PARTITIONED_TABLES)
+    )
+
+
+def month(value):
+    return date.fromisoformat(f"{value}-01")
+
+
+async def run(args):
+    conn = await asyncpg.connect(os.environ["DATABASE_URL"], ssl=os.getenv("DB_SSL", "require"))
+    try:
+        if not await is_partitioned(conn):
+            raise SystemExit("attendance_logs and orders are not partitioned yet; run migrate.py first")
+        if args.ahead is not None:
+            print(f"Created {await ensure_partitions(conn, args.ahead)} partition(s)")
+        if args.detach_before is not None:
+            detached = await detach_partitions(conn, args.detach_before)
+            print(f"Detached {len(detached)} partition(s): {', '.join(detached) or '-'}")
+        if args.ahead is None and args.detach_before is None:
+            for row in await list_partitions(conn):
+                print(f"{row['partition']:<28} {row['bounds']:<60} ~{row['rows']:>10,} rows "
+                      f"{row['bytes'] / 1024 / 1024:>8.1f} MB")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ahead", type=int, metavar="MONTHS", help="create partitions through MONTHS months from now")
+    parser.add_argument("--detach-before", type=month, metavar="YYYY-MM", help="detach the months before this one")
+    args = parser.parse_args()
+
+    load_dotenv()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Recompute the sales_history / sales_history_hourly rollups from orders.
+
+Triggers on orders keep the rollups current; this is for repairing a date range
+after restoring a backup, loading orders with triggers disabled, or editing
+rollup rows by hand.
+
+    cd backend && python rebuild_sales.py --from 2026-01-01 --to 2026-10-31
+    cd backend && python rebuild_sales.py --all
+"""
+import argparse
+import asyncio
+import os
+from datetime import date
+
+import asyncpg
+from dotenv import load_dotenv
+
+
+async def rebuild(from_date, to_date):
+    conn = await asyncpg.connect(os.environ["DATABASE_URL"], ssl=os.getenv("DB_SSL", "require"))
+    try:
+        async with conn.transaction():
+            if from_date is None:
+                from_date, to_date = await conn.fetchrow(
+                    "SELECT MIN(timestamp)::date, MAX(timestamp)::date FROM orders"
+                )
+                if from_date is None:
+                    print("No orders; nothing to rebuild")
+                    return
+            days = await conn.fetchval("SELECT rebuild_sales_rollups($1, $2)", from_date, to_date)
+        print(f"Rebuilt sales rollups for {from_date} .. {to_date}: {days} day(s) with sales")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, help="last day, inclusive (YYYY-MM-DD)")
+    parser.add_argument("--all", action="store_true", help="rebuild every day that has orders")
+    args = parser.parse_args()
+    if args.all == (args.from_date is not None or args.to_date is not None):
+        parser.error("pass either --from/--to or --all")
+    if not args.all and (args.from_date is None or args.to_date is None):
+        parser.error("--from and --to go together")
+
+    load_dotenv()
+    asyncio.run(rebuild(args.from_date, args.to_date))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,53 +6,16 @@ async function renderAnalytics() {
   }
 
   const universalRange = Number(universalRangeSelect?.value || 7);
-  const kpiCutoff = new Date();
-  kpiCutoff.setHours(0, 0, 0, 0);
-  kpiCutoff.setDate(kpiCutoff.getDate() - (universalRange - 1));
-
-  let totalSalesKpi = (appState.salesHistory || [])
-    .filter((entry) => parseDateKey(entry.date) >= kpiCutoff)
-    .reduce((sum, entry) => sum + (entry.total || 0), 0);
-
-  // Calculate from orders if sales_history is empty
-  if (totalSalesKpi === 0 && appState.orders && appState.orders.length > 0) {
-    totalSalesKpi = appState.orders.reduce((sum, order) => {
-      if (order.timestamp) {
-        const orderDate = new Date(order.timestamp);
-        if (orderDate >= kpiCutoff) {
-          return sum + (order.total || 0);
-        }
-      }
-      return sum;
-    }, 0);
-  }
 
-  const totalAttendanceKpi = (appState.attendanceLogs || []).filter(
-    (log) =>
-      log.action === "in" &&
-      new Date(log.timestamp) >= kpiCutoff &&
-      !log.archived
-  ).length;
-
-  // Calculate additional KPIs
-  const ordersInPeriod = (appState.orders || []).filter((order) => {
-    if (order.timestamp) {
-      const orderDate = new Date(order.timestamp);
-      return orderDate >= kpiCutoff;
-    }
-    return false;
-  });
+  // Sales, order, product and attendance aggregates come from one server-side summary
+  const summary = await fetchAnalyticsSummary(universalRange);
 
-  const totalOrders = ordersInPeriod.length;
-
-  // Calculate metrics for KPIs
-  const inventoryItems = appState.inventory || [];
-  const inventoryValue = inventoryItems.reduce((sum, item) => {
-    return sum + (item.quantity || 0) * (item.cost || 0);
-  }, 0);
+  const totalSalesKpi = summary.sales.revenue;
+  const totalOrders = summary.sales.orders;
+  const inventoryValue = summary.inventoryValue;
   const inventoryTurnover =
     inventoryValue > 0 ? (totalSalesKpi / inventoryValue).toFixed(1) : "0.0";
-  const avgTicket = totalOrders > 0 ? totalSalesKpi / totalOrders : 0;
+  const avgTicket = summary.sales.averageTicket;
 
   const kpiMap = {
     "kpi-sales": formatCurrency(totalSalesKpi),
@@ -66,70 +29,7 @@ async function renderAnalytics() {
   });
 
   // Render Peak Hour Efficiency Chart using universal filter
-  const ordersForPeakHour = (appState.orders || []).filter((order) => {
-    if (order.timestamp) {
-      const orderDate = new Date(order.timestamp);
-      return orderDate >= kpiCutoff;
-    }
-    return false;
-  });
-  renderPeakHourChart(ordersForPeakHour);
-
-  // Calculate attendance trend from actual attendance logs
-  const computeAttendanceTrend = () => {
-    const trend = [];
-    const daysToShow = universalRange;
-    const today = new Date();
-
-    for (let i = daysToShow - 1; i >= 0; i--) {
-      const date = new Date(today);
-      date.setDate(date.getDate() - i);
-      const dateKey = date.toISOString().split("T")[0];
-
-      // Count logs for this day
-      const dayLogs = (appState.attendanceLogs || []).filter(
-        (log) => log.timestamp.startsWith(dateKey) && !log.archived
-      );
-
-      const present = dayLogs.filter((log) => log.action === "in").length;
-      const late = dayLogs.filter(
-        (log) =>
-          log.action === "in" &&
-          log.note &&
-          log.note.toLowerCase().includes("late")
-      ).length;
-      const onLeave = dayLogs.filter((log) => log.action === "leave").length;
-
-      trend.push({
-        date: dateKey,
-        present: present,
-        late: late,
-        onLeave: onLeave,
-      });
-    }
-
-    return trend;
-  };
-
-  const attendanceTrendData = computeAttendanceTrend();
-  const attendanceWindow = attendanceTrendData;
-
-  console.log("Attendance Trend Data:", {
-    total: attendanceTrendData.length,
-    window: attendanceWindow.length,
-    sample: attendanceWindow[0],
-    lastEntry: attendanceWindow[attendanceWindow.length - 1],
-  });
-
-  // Check if attendance trend has any actual data
-  const hasAttendanceData = attendanceWindow.some(
-    (day) => day.present > 0 || day.late > 0 || day.onLeave > 0
-  );
-  if (!hasAttendanceData && attendanceWindow.length > 0) {
-    console.warn(
-      "⚠️ Attendance trend contains 30 days but all counts are zero. The 'attendance_logs' table may be empty or contain no 'action=in' records. Use the Attendance page to clock in employees."
-    );
-  }
+  renderPeakHourChart(summary.ordersByHour);
 
   console.log("Analytics Data Check:", {
     orders: appState.orders?.length || 0,
@@ -145,62 +45,11 @@ async function renderAnalytics() {
     attendanceTrendSample: appState.attendanceTrend?.[0],
   });
 
-  // Calculate top selling products by revenue
-  const productRevenue = {};
-  (appState.orders || []).forEach((order) => {
-    try {
-      // Check multiple possible field names for items
-      let items = null;
-
-      if (order.itemsJson) {
-        items = Array.isArray(order.itemsJson) ? order.itemsJson : null;
-      } else if (order.items_json) {
-        items = Array.isArray(order.items_json) ? order.items_json : null;
-      } else if (order.items) {
-        items =
-          typeof order.items === "string"
-            ? JSON.parse(order.items)
-            : order.items;
-      }
-
-      // Ensure items is an array
-      if (!Array.isArray(items) || items.length === 0) {
-        return;
-      }
-
-      // Calculate revenue per item based on order total
-      const totalQty = items.reduce((sum, item) => sum + (item.qty || 0), 0);
-      const orderTotal = order.total || 0;
-
-      items.forEach((item) => {
-        const key = item.name || "Unknown";
-        // If unitPrice exists, use it; otherwise distribute order total proportionally
-        const revenue = item.unitPrice
-          ? (item.unitPrice || 0) * (item.qty || 0)
-          : totalQty > 0
-          ? (orderTotal * (item.qty || 0)) / totalQty
-          : 0;
-        productRevenue[key] = (productRevenue[key] || 0) + revenue;
-      });
-    } catch (e) {
-      console.error("Error parsing order items:", e, "Order:", order);
-    }
-  });
-
-  const topProducts = Object.entries(productRevenue)
-    .map(([name, revenue]) => ({ name, revenue }))
-    .sort((a, b) => b.revenue - a.revenue)
-    .slice(0, 5);
-
-  console.log("Top Selling Products:", {
-    totalProducts: Object.keys(productRevenue).length,
-    topProducts: topProducts,
-    sampleRevenue: Object.entries(productRevenue).slice(0, 3),
-    processedOrders: (appState.orders || []).length,
-    ordersWithItems: (appState.orders || []).filter(
-      (o) => o.itemsJson && Array.isArray(o.itemsJson) && o.itemsJson.length > 0
-    ).length,
-  });
+  // Top selling products by revenue
+  const topProducts = summary.topItems.map((item) => ({
+    name: item.name,
+    revenue: item.revenue,
+  }));
 
   // Generate inventory recommendations
   const recommendationsDiv = document.getElementById(
@@ -324,11 +173,6 @@ async function renderAnalytics() {
     "Saturday",
   ];
 
-  // Calculate cutoff date based on universal range
-  const revenueCutoff = new Date();
-  revenueCutoff.setHours(0, 0, 0, 0);
-  revenueCutoff.setDate(revenueCutoff.getDate() - (universalRange - 1));
-
   // Determine number of weeks to display based on filter
   let weeksToShow = 1;
   if (universalRange === 14) weeksToShow = 2;
@@ -340,20 +184,15 @@ async function renderAnalytics() {
     weeklyData.push([0, 0, 0, 0, 0, 0, 0]);
   }
 
-  // Filter orders by date range and group by week and day
-  (appState.orders || []).forEach((order) => {
-    if (order.timestamp) {
-      const orderDate = new Date(order.timestamp);
-      if (orderDate >= revenueCutoff) {
-        const dayIndex = orderDate.getDay();
-        const daysAgo = Math.floor(
-          (new Date() - orderDate) / (1000 * 60 * 60 * 24)
-        );
-        const weekIndex = Math.floor(daysAgo / 7);
-        if (weekIndex < weeksToShow) {
-          weeklyData[weekIndex][dayIndex] += order.total || 0;
-        }
-      }
+  // Group daily revenue by week and day
+  const todayStart = parseDateKey(todayKey());
+  summary.revenueByDay.forEach((entry) => {
+    const entryDate = parseDateKey(entry.date);
+    const dayIndex = entryDate.getDay();
+    const daysAgo = Math.round((todayStart - entryDate) / (1000 * 60 * 60 * 24));
+    const weekIndex = Math.floor(daysAgo / 7);
+    if (weekIndex < weeksToShow) {
+      weeklyData[weekIndex][dayIndex] += entry.revenue || 0;
     }
   });
 
@@ -405,98 +244,13 @@ async function renderAnalytics() {
   });
 
   // Attendance Trend - Multi-line chart showing daily frequency of each status
-  // Fetch attendance data directly from database with date range
-  const attendanceDays = universalRange;
-  const attendanceLabels = [];
-  const presentData = [];
-  const lateData = [];
-  const absentData = [];
-  const leaveData = [];
-
-  // Calculate date range
-  const endDate = new Date();
-  endDate.setDate(endDate.getDate() + 1); // Include today
-  const startDate = new Date();
-  startDate.setDate(startDate.getDate() - attendanceDays + 1);
-
-  try {
-    // Fetch attendance logs from database
-    const startDateStr = startDate.toISOString().split("T")[0];
-    const endDateStr = endDate.toISOString().split("T")[0];
-    const baseUrl =
-      typeof window !== "undefined" && window.APP_STATE_ENDPOINT
-        ? window.APP_STATE_ENDPOINT.replace("/api/state", "")
-        : "";
-
-    const response = await fetch(
-      `${baseUrl}/api/attendance-logs?start_date=${startDateStr}&end_date=${endDateStr}&limit=5000`,
-      { credentials: "include" }
-    );
-
-    if (!response.ok) {
-      throw new Error(`Failed to fetch attendance logs: ${response.status}`);
-    }
-
-    const attendanceLogs = await response.json();
-    console.log(
-      `Fetched ${attendanceLogs.length} attendance logs for date range ${startDateStr} to ${endDateStr}`
-    );
-
-    // Build date labels and calculate status counts
-    for (let i = attendanceDays - 1; i >= 0; i--) {
-      const date = new Date();
-      date.setDate(date.getDate() - i);
-      const dateKey = date.toISOString().split("T")[0];
-      const month = date.getMonth() + 1;
-      const day = date.getDate();
-      attendanceLabels.push(`${month}/${day}`);
-
-      // Get all logs for this day
-      const dayLogs = (attendanceLogs || []).filter(
-        (log) => log.timestamp.startsWith(dateKey) && !log.archived
-      );
-
-      // Count clock-ins with late notes
-      const lateCount = dayLogs.filter(
-        (log) =>
-          log.action === "in" &&
-          log.note &&
-          (log.note.toLowerCase().includes("late") ||
-            log.note.toLowerCase().includes("Late"))
-      ).length;
-
-      // Count present (clock-ins that are not late)
-      const clockInCount = dayLogs.filter((log) => log.action === "in").length;
-      const presentCount = clockInCount - lateCount;
-
-      // Count leave logs
-      const leaveCount = dayLogs.filter((log) => log.action === "leave").length;
-
-      // Count absent logs
-      const absentCount = dayLogs.filter(
-        (log) => log.action === "absent"
-      ).length;
-
-      presentData.push(presentCount);
-      lateData.push(lateCount);
-      absentData.push(absentCount);
-      leaveData.push(leaveCount);
-    }
-  } catch (error) {
-    console.error("Error fetching attendance logs for trend chart:", error);
-    // Fill with zeros if fetch fails
-    for (let i = 0; i < attendanceDays; i++) {
-      const date = new Date();
-      date.setDate(date.getDate() - (attendanceDays - 1 - i));
-      const month = date.getMonth() + 1;
-      const day = date.getDate();
-      attendanceLabels.push(`${month}/${day}`);
-      presentData.push(0);
-      lateData.push(0);
-      absentData.push(0);
-      leaveData.push(0);
-    }
-  }
+  const attendanceLabels = summary.attendanceByDay.map((day) =>
+    formatDateShort(day.date)
+  );
+  const presentData = summary.attendanceByDay.map((day) => day.present);
+  const lateData = summary.attendanceByDay.map((day) => day.late);
+  const absentData = summary.attendanceByDay.map((day) => day.absent);
+  const leaveData = summary.attendanceByDay.map((day) => day.leave);
 
   ChartManager.plot("attendanceTrendChart", {
     type: "line",
@@ -580,10 +334,10 @@ async function renderAnalytics() {
 
   // Order Type Distribution pie chart (in top row)
   const orderTypes = { "dine-in": 0, pickup: 0, delivery: 0 };
-  (appState.orders || []).forEach((order) => {
-    const type = (order.orderType || order.type || "dine-in").toLowerCase();
+  summary.revenueByType.forEach((entry) => {
+    const type = (entry.type || "dine-in").toLowerCase();
     if (orderTypes.hasOwnProperty(type)) {
-      orderTypes[type]++;
+      orderTypes[type] += entry.orders;
     }
   });
 
@@ -835,17 +589,17 @@ function renderBestProductsChart(filterCategory = "all") {
 }
 
 // Render Peak Hour Efficiency Chart
-function renderPeakHourChart(ordersInPeriod) {
-  // Group orders by hour
+function renderPeakHourChart(ordersByHour) {
+  // Orders per hour of day, from the summary's hourly rollup
   const hourlyOrders = {};
   for (let hour = 0; hour < 24; hour++) {
     hourlyOrders[hour] = 0;
   }
+  let totalOrders = 0;
 
-  ordersInPeriod.forEach((order) => {
-    if (!order.timestamp) return;
-    const hour = new Date(order.timestamp).getHours();
-    hourlyOrders[hour]++;
+  (ordersByHour || []).forEach((entry) => {
+    hourlyOrders[entry.hour] = entry.orders;
+    totalOrders += entry.orders;
   });
 
   // Find peak hours
@@ -865,9 +619,7 @@ function renderPeakHourChart(ordersInPeriod) {
   const insightsDiv = document.getElementById("peak-hour-insights");
   if (insightsDiv) {
     const avgOrdersPerHour =
-      ordersInPeriod.length > 0
-        ? (ordersInPeriod.length / 24).toFixed(1)
-        : "0.0";
+      totalOrders > 0 ? (totalOrders / 24).toFixed(1) : "0.0";
     insightsDiv.innerHTML = `
       <strong>📊 Peak Hour:</strong> ${formatHour(peakHour.hour)} with ${
       peakHour.count
@@ -926,5 +678,57 @@ function renderPeakHourChart(ordersInPeriod) {
   });
 }
 
+// YYYY-MM-DD key `days` days away from `key` (local time)
+function shiftDateKey(key, days) {
+  const date = parseDateKey(key);
+  date.setDate(date.getDate() + days);
+  const month = String(date.getMonth() + 1).padStart(2, "0");
+  const day = String(date.getDate()).padStart(2, "0");
+  return `${date.getFullYear()}-${month}-${day}`;
+}
+
+// Aggregates for the last `days` days, computed by /api/analytics/summary
+async function fetchAnalyticsSummary(days) {
+  const to = todayKey();
+  const from = shiftDateKey(to, -(days - 1));
+  const baseUrl =
+    typeof window !== "undefined" && window.APP_STATE_ENDPOINT
+      ? window.APP_STATE_ENDPOINT.replace("/api/state", "")
+      : "";
+
+  try {
+    const response = await fetch(
+      `${baseUrl}/api/analytics/summary?from=${from}&to=${to}`,
+      { credentials: "include" }
+    );
+    if (!response.ok) {
+      throw new Error(`Failed to fetch analytics summary: ${response.status}`);
+    }
+    return await response.json();
+  } catch (error) {
+    console.error("Error fetching analytics summary:", error);
+    // Render the page with zeros rather than not at all
+    const attendanceByDay = [];
+    for (let i = days - 1; i >= 0; i--) {
+      attendanceByDay.push({
+        date: shiftDateKey(to, -i),
+        present: 0,
+        late: 0,
+        absent: 0,
+        leave: 0,
+      });
+    }
+    return {
+      sales: { revenue: 0, orders: 0, averageTicket: 0 },
+      revenueByDay: [],
+      ordersByHour: [],
+      revenueByType: [],
+      topItems: [],
+      attendanceByDay,
+      inventoryValue: 0,
+    };
+  }
+}
+
 window.pageRenderers = window.pageRenderers || {};
 window.pageRenderers["analytics"] = renderAnalytics;
@@ -7,6 +7,7 @@ function initializeArchive() {
   setupRefreshButton();
   setupDeleteAllButtons();
   renderArchive();
+  loadColdArchive().then(renderArchive);
 }
 
 function setupTabs() {
@@ -57,7 +58,7 @@ function setupDeleteAllButtons() {
   const deleteAllOrdersBtn = document.getElementById("delete-all-orders");
   if (deleteAllOrdersBtn) {
     deleteAllOrdersBtn.addEventListener("click", async () => {
-      const archivedOrders = (appState.orders || []).filter((o) => o.archived);
+      const archivedOrders = archivedRows("orders");
       if (archivedOrders.length === 0) {
         showAlert("No archived orders to delete", "info");
         return;
@@ -70,9 +71,7 @@ function setupDeleteAllButtons() {
   const deleteAllInventoryBtn = document.getElementById("delete-all-inventory");
   if (deleteAllInventoryBtn) {
     deleteAllInventoryBtn.addEventListener("click", async () => {
-      const archivedInventory = (appState.inventory || []).filter(
-        (i) => i.archived
-      );
+      const archivedInventory = archivedRows("inventory");
       if (archivedInventory.length === 0) {
         showAlert("No archived inventory to delete", "info");
         return;
@@ -85,7 +84,7 @@ function setupDeleteAllButtons() {
   const deleteAllUsersBtn = document.getElementById("delete-all-users");
   if (deleteAllUsersBtn) {
     deleteAllUsersBtn.addEventListener("click", async () => {
-      const archivedUsers = (appState.users || []).filter((u) => u.archived);
+      const archivedUsers = archivedRows("users");
       if (archivedUsers.length === 0) {
         showAlert("No archived users to delete", "info");
         return;
@@ -100,9 +99,7 @@ function setupDeleteAllButtons() {
   );
   if (deleteAllAttendanceBtn) {
     deleteAllAttendanceBtn.addEventListener("click", async () => {
-      const archivedAttendance = (appState.attendanceLogs || []).filter(
-        (a) => a.archived
-      );
+      const archivedAttendance = archivedRows("attendance-logs");
       if (archivedAttendance.length === 0) {
         showAlert("No archived attendance logs to delete", "info");
         return;
@@ -117,9 +114,7 @@ function setupDeleteAllButtons() {
   );
   if (deleteAllUsageLogsBtn) {
     deleteAllUsageLogsBtn.addEventListener("click", async () => {
-      const archivedUsageLogs = (appState.inventoryUsageLogs || []).filter(
-        (l) => l.archived
-      );
+      const archivedUsageLogs = archivedRows("inventory-usage-logs");
       if (archivedUsageLogs.length === 0) {
         showAlert("No archived usage logs to delete", "info");
         return;
@@ -129,6 +124,104 @@ function setupDeleteAllButtons() {
   }
 }
 
+// Archive, restore or delete many rows of one type in a single request
+async function bulkArchiveAction(type, action, ids) {
+  const response = await fetch(
+    `${window.API_BASE_URL || ""}/api/${type}/bulk`,
+    {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      credentials: "include",
+      body: JSON.stringify({ action, ids }),
+    }
+  );
+  if (!response.ok) throw new Error(`Bulk ${action} of ${type} failed`);
+  return response.json();
+}
+
+// Rows archived long ago are moved to the cold archive on the server
+// (backend/cold_archive.py) and no longer come with appState. They are loaded
+// separately, per bulk endpoint type, and kept out of appState so saving the
+// state never writes them back to the live tables.
+const COLD_ARCHIVE_STATE_KEYS = {
+  orders: "orders",
+  inventory: "inventory",
+  users: "users",
+  "attendance-logs": "attendanceLogs",
+  "inventory-usage-logs": "inventoryUsageLogs",
+};
+const coldArchive = {};
+
+async function loadColdArchive() {
+  const apiBase = window.API_BASE_URL || "";
+  await Promise.all(
+    Object.keys(COLD_ARCHIVE_STATE_KEYS).map(async (type) => {
+      try {
+        const response = await fetch(
+          `${apiBase}/api/archive/${type}?limit=1000`,
+          { credentials: "include" }
+        );
+        if (response.ok) coldArchive[type] = await response.json();
+      } catch (error) {
+        console.error(`Error loading cold archived ${type}:`, error);
+      }
+    })
+  );
+}
+
+// Archived rows of one type: those in appState, then the cold ones
+function archivedRows(type) {
+  const rows = appState[COLD_ARCHIVE_STATE_KEYS[type]] || [];
+  const liveIds = new Set(rows.map((row) => String(row.id)));
+  return rows
+    .filter((row) => row.archived)
+    .concat(
+      (coldArchive[type] || []).filter((row) => !liveIds.has(String(row.id)))
+    );
+}
+
+function findColdRow(type, id) {
+  return (coldArchive[type] || []).find((row) => String(row.id) === String(id));
+}
+
+// Drop rows the server has restored or deleted from the cold archive
+function takeColdRows(type, ids) {
+  const taken = new Set(ids.map(String));
+  const rows = coldArchive[type] || [];
+  coldArchive[type] = rows.filter((row) => !taken.has(String(row.id)));
+  return rows.filter((row) => taken.has(String(row.id)));
+}
+
+// A bulk restore moves cold rows back to the live table, unarchived
+function addRestoredColdRows(type, ids) {
+  const key = COLD_ARCHIVE_STATE_KEYS[type];
+  const restored = takeColdRows(type, ids).map(({ movedAt, ...row }) => ({
+    ...row,
+    archived: false,
+    archivedAt: null,
+    archivedBy: null,
+  }));
+  appState[key] = (appState[key] || []).concat(restored);
+}
+
+// Restore or permanently delete one cold row; `label` names it in the toast
+async function coldRowAction(type, action, id, label) {
+  try {
+    await bulkArchiveAction(type, action, [id]);
+    if (action === "restore") {
+      addRestoredColdRows(type, [id]);
+      showToast(`${label} restored successfully`, "success");
+    } else {
+      takeColdRows(type, [id]);
+      showToast(`${label} permanently deleted`, "warning");
+    }
+    renderArchive();
+  } catch (error) {
+    console.error(`Error in ${action} of cold archived ${type}:`, error);
+    showToast(`Failed to ${action} ${label.toLowerCase()}`, "error");
+  }
+}
+
 async function deleteAllArchived(type, items) {
   const confirmed = await showConfirmAlert(
     `Delete All Archived ${type.charAt(0).toUpperCase() + type.slice(1)}?`,
@@ -140,47 +233,35 @@ async function deleteAllArchived(type, items) {
   showLoading(`Deleting ${items.length} items...`);
 
   try {
-    const deletePromises = items.map((item) =>
-      fetch(`${window.API_BASE_URL || ""}/api/${type}/${item.id}`, {
-        method: "DELETE",
-        credentials: "include",
-      })
+    const result = await bulkArchiveAction(
+      type,
+      "delete",
+      items.map((item) => item.id)
     );
-
-    const results = await Promise.all(deletePromises);
-    const successCount = results.filter((res) => res.ok).length;
-
     hideLoading();
 
-    if (successCount === items.length) {
-      // Remove from appState
-      if (type === "orders") {
-        appState.orders = (appState.orders || []).filter((o) => !o.archived);
-      } else if (type === "inventory") {
-        appState.inventory = (appState.inventory || []).filter(
-          (i) => !i.archived
-        );
-      } else if (type === "users") {
-        appState.users = (appState.users || []).filter((u) => !u.archived);
-      } else if (type === "attendance-logs") {
-        appState.attendanceLogs = (appState.attendanceLogs || []).filter(
-          (a) => !a.archived
-        );
-      } else if (type === "inventory-usage-logs") {
-        appState.inventoryUsageLogs = (
-          appState.inventoryUsageLogs || []
-        ).filter((l) => !l.archived);
-      }
-
-      showAlert(`Successfully deleted ${successCount} item(s)`, "success");
-      renderArchive();
-    } else {
-      showAlert(
-        `Deleted ${successCount} of ${items.length} items. Some deletions failed.`,
-        "warning"
+    // The bulk delete is one transaction, so every item is gone from here on
+    coldArchive[type] = [];
+    if (type === "orders") {
+      appState.orders = (appState.orders || []).filter((o) => !o.archived);
+    } else if (type === "inventory") {
+      appState.inventory = (appState.inventory || []).filter(
+        (i) => !i.archived
       );
-      renderArchive();
+    } else if (type === "users") {
+      appState.users = (appState.users || []).filter((u) => !u.archived);
+    } else if (type === "attendance-logs") {
+      appState.attendanceLogs = (appState.attendanceLogs || []).filter(
+        (a) => !a.archived
+      );
+    } else if (type === "inventory-usage-logs") {
+      appState.inventoryUsageLogs = (
+        appState.inventoryUsageLogs || []
+      ).filter((l) => !l.archived);
     }
+
+    showAlert(`Successfully deleted ${result.affected} item(s)`, "success");
+    renderArchive();
   } catch (error) {
     hideLoading();
     console.error("Error deleting all archived items:", error);
@@ -207,9 +288,7 @@ function renderArchivedOrders() {
   const tbody = document.querySelector("#archive-orders-table tbody");
   if (!tbody) return;
 
-  const archivedOrders = (appState.orders || []).filter(
-    (order) => order.archived
-  );
+  const archivedOrders = archivedRows("orders");
 
   tbody.innerHTML = "";
 
@@ -270,9 +349,7 @@ function renderArchivedInventory() {
   const tbody = document.querySelector("#archive-inventory-table tbody");
   if (!tbody) return;
 
-  const archivedItems = (appState.inventory || []).filter(
-    (item) => item.archived
-  );
+  const archivedItems = archivedRows("inventory");
 
   tbody.innerHTML = "";
 
@@ -337,7 +414,7 @@ function renderArchivedUsers() {
   const tbody = document.querySelector("#archive-users-table tbody");
   if (!tbody) return;
 
-  const archivedUsers = (appState.users || []).filter((user) => user.archived);
+  const archivedUsers = archivedRows("users");
 
   tbody.innerHTML = "";
 
@@ -398,9 +475,7 @@ function renderArchivedAttendanceLogs() {
   const tbody = document.querySelector("#archive-attendance-table tbody");
   if (!tbody) return;
 
-  const archivedLogs = (appState.attendanceLogs || []).filter(
-    (log) => log.archived
-  );
+  const archivedLogs = archivedRows("attendance-logs");
 
   tbody.innerHTML = "";
 
@@ -475,7 +550,12 @@ function renderArchivedAttendanceLogs() {
 // Restore Functions
 async function restoreOrder(orderId) {
   const order = appState.orders.find((o) => o.id === orderId);
-  if (!order) return;
+  if (!order) {
+    if (findColdRow("orders", orderId)) {
+      await coldRowAction("orders", "restore", orderId, "Order");
+    }
+    return;
+  }
 
   order.archived = false;
   order.archivedAt = null;
@@ -515,7 +595,12 @@ async function restoreOrder(orderId) {
 
 async function restoreInventory(itemId) {
   const item = appState.inventory.find((i) => i.id === itemId);
-  if (!item) return;
+  if (!item) {
+    if (findColdRow("inventory", itemId)) {
+      await coldRowAction("inventory", "restore", itemId, "Inventory item");
+    }
+    return;
+  }
 
   item.archived = false;
   item.archivedAt = null;
@@ -555,7 +640,12 @@ async function restoreInventory(itemId) {
 
 async function restoreUser(userId) {
   const user = appState.users.find((u) => u.id === userId);
-  if (!user) return;
+  if (!user) {
+    if (findColdRow("users", userId)) {
+      await coldRowAction("users", "restore", userId, "User");
+    }
+    return;
+  }
 
   user.archived = false;
   user.archivedAt = null;
@@ -595,13 +685,17 @@ async function restoreUser(userId) {
 
 // Delete Functions (permanent)
 function deleteOrder(orderId) {
-  const order = appState.orders.find((o) => o.id === orderId);
+  const order = appState.orders.find((o) => o.id === orderId) || findColdRow("orders", orderId);
   if (!order) return;
 
   showDeleteConfirmation(
     "Permanently Delete Order?",
     `This will permanently delete order ${orderId}. This action cannot be undone.`,
     async () => {
+      if (order.movedAt) {
+        await coldRowAction("orders", "delete", orderId, "Order");
+        return;
+      }
       try {
         const apiBase = window.API_BASE_URL || "";
         let response = await fetch(`${apiBase}/api/orders/${orderId}`, {
@@ -638,13 +732,17 @@ function deleteOrder(orderId) {
 }
 
 function deleteInventory(itemId) {
-  const item = appState.inventory.find((i) => i.id === itemId);
+  const item = appState.inventory.find((i) => i.id === itemId) || findColdRow("inventory", itemId);
   if (!item) return;
 
   showDeleteConfirmation(
     "Permanently Delete Item?",
     `This will permanently delete ${item.name}. This action cannot be undone.`,
     async () => {
+      if (item.movedAt) {
+        await coldRowAction("inventory", "delete", itemId, "Inventory item");
+        return;
+      }
       try {
         const apiBase = window.API_BASE_URL || "";
         let response = await fetch(`${apiBase}/api/inventory/${itemId}`, {
@@ -685,13 +783,17 @@ function deleteInventory(itemId) {
 }
 
 function deleteUser(userId) {
-  const user = appState.users.find((u) => u.id === userId);
+  const user = appState.users.find((u) => u.id === userId) || findColdRow("users", userId);
   if (!user) return;
 
   showDeleteConfirmation(
     "Permanently Delete User?",
     `This will permanently delete ${user.name}. This action cannot be undone.`,
     async () => {
+      if (user.movedAt) {
+        await coldRowAction("users", "delete", userId, "User");
+        return;
+      }
       try {
         const apiBase = window.API_BASE_URL || "";
         let response = await fetch(`${apiBase}/api/users/${userId}`, {
@@ -760,7 +862,9 @@ function showDeleteConfirmation(title, message, onConfirm) {
 
 // Restore Attendance Log
 async function restoreAttendanceLog(logId) {
-  const log = appState.attendanceLogs.find((l) => l.id === logId);
+  const log =
+    appState.attendanceLogs.find((l) => l.id === logId) ||
+    findColdRow("attendance-logs", logId);
   if (!log) return;
 
   // Check if there's already a non-archived log for this employee on the same day
@@ -785,6 +889,11 @@ async function restoreAttendanceLog(logId) {
     return;
   }
 
+  if (log.movedAt) {
+    await coldRowAction("attendance-logs", "restore", logId, "Attendance log");
+    return;
+  }
+
   log.archived = false;
   log.archivedAt = null;
   log.archivedBy = null;
@@ -801,7 +910,9 @@ async function restoreAttendanceLog(logId) {
 
 // Delete Attendance Log
 function deleteAttendanceLog(logId) {
-  const log = appState.attendanceLogs.find((l) => l.id === logId);
+  const log =
+    appState.attendanceLogs.find((l) => l.id === logId) ||
+    findColdRow("attendance-logs", logId);
   if (!log) return;
 
   const employee = (appState.users || []).find((u) => u.id === log.employeeId);
@@ -813,6 +924,10 @@ function deleteAttendanceLog(logId) {
       log.timestamp
     )}). This action cannot be undone.`,
     async () => {
+      if (log.movedAt) {
+        await coldRowAction("attendance-logs", "delete", logId, "Attendance log");
+        return;
+      }
       try {
         const apiBase = window.API_BASE_URL || "";
         const response = await fetch(
@@ -879,10 +994,8 @@ function renderArchivedUsageLogs() {
   const tbody = document.querySelector("#archive-usage-logs-table tbody");
   if (!tbody) return;
 
-  // Fetch from appState - will be loaded by getAppState
-  const archivedLogs = (appState.inventoryUsageLogs || []).filter(
-    (log) => log.archived
-  );
+  // From appState (loaded by getAppState) and the cold archive
+  const archivedLogs = archivedRows("inventory-usage-logs");
 
   tbody.innerHTML = "";
 
@@ -1090,7 +1203,9 @@ function renderArchivedUsageLogs() {
 
 // Restore Usage Log
 async function restoreUsageLog(logId) {
-  const log = (appState.inventoryUsageLogs || []).find((l) => l.id == logId);
+  const log =
+    (appState.inventoryUsageLogs || []).find((l) => l.id == logId) ||
+    findColdRow("inventory-usage-logs", logId);
   if (!log) return;
 
   const confirmed = await showConfirmAlert(
@@ -1102,6 +1217,21 @@ async function restoreUsageLog(logId) {
 
   showLoading("Restoring usage log...");
 
+  if (log.movedAt) {
+    try {
+      await bulkArchiveAction("inventory-usage-logs", "restore", [log.id]);
+      addRestoredColdRows("inventory-usage-logs", [log.id]);
+      hideLoading();
+      showAlert("Usage log restored successfully!", "success");
+      renderArchive();
+    } catch (error) {
+      hideLoading();
+      console.error("Error restoring usage log:", error);
+      showAlert("Failed to restore usage log", "error");
+    }
+    return;
+  }
+
   log.archived = false;
   log.archivedAt = null;
   log.archivedBy = null;
@@ -1132,8 +1262,8 @@ async function restoreUsageLog(logId) {
 
 // Restore all usage logs in a batch
 async function restoreBatchUsageLogs(batchId) {
-  const batchLogs = (appState.inventoryUsageLogs || []).filter(
-    (log) => log.batchId === batchId && log.archived
+  const batchLogs = archivedRows("inventory-usage-logs").filter(
+    (log) => log.batchId === batchId
   );
 
   if (batchLogs.length === 0) return;
@@ -1148,29 +1278,23 @@ async function restoreBatchUsageLogs(batchId) {
   showLoading("Restoring batch logs...");
 
   try {
-    const restorePromises = batchLogs.map((log) => {
+    await bulkArchiveAction(
+      "inventory-usage-logs",
+      "restore",
+      batchLogs.map((log) => log.id)
+    );
+    batchLogs.forEach((log) => {
       log.archived = false;
       log.archivedAt = null;
       log.archivedBy = null;
-
-      return fetch(
-        `${window.API_BASE_URL || ""}/api/inventory-usage-logs/${log.id}`,
-        {
-          method: "PUT",
-          headers: { "Content-Type": "application/json" },
-          credentials: "include",
-          body: JSON.stringify(log),
-        }
-      );
     });
-
-    const results = await Promise.all(restorePromises);
-    const allSuccess = results.every((res) => res.ok);
+    addRestoredColdRows(
+      "inventory-usage-logs",
+      batchLogs.filter((log) => log.movedAt).map((log) => log.id)
+    );
 
     hideLoading();
 
-    if (!allSuccess) throw new Error("Failed to restore some logs");
-
     showAlert("Batch logs restored successfully!", "success");
     renderArchive();
   } catch (error) {
@@ -1192,18 +1316,23 @@ async function deleteUsageLog(logId) {
   showLoading("Deleting usage log...");
 
   try {
-    const response = await fetch(
-      `${window.API_BASE_URL || ""}/api/inventory-usage-logs/${logId}`,
-      {
-        method: "DELETE",
-        credentials: "include",
-      }
-    );
+    if (findColdRow("inventory-usage-logs", logId)) {
+      // The bulk endpoint deletes from the cold archive as well
+      await bulkArchiveAction("inventory-usage-logs", "delete", [logId]);
+      takeColdRows("inventory-usage-logs", [logId]);
+    } else {
+      const response = await fetch(
+        `${window.API_BASE_URL || ""}/api/inventory-usage-logs/${logId}`,
+        {
+          method: "DELETE",
+          credentials: "include",
+        }
+      );
+      if (!response.ok) throw new Error("Failed to delete");
+    }
 
     hideLoading();
 
-    if (!response.ok) throw new Error("Failed to delete");
-
     // Remove from appState
     appState.inventoryUsageLogs = (appState.inventoryUsageLogs || []).filter(
       (l) => l.id != logId
@@ -1220,9 +1349,9 @@ async function deleteUsageLog(logId) {
 
 // Delete all usage logs in a batch
 async function deleteBatchUsageLogs(batchId) {
-  const batchLogs = (appState.inventoryUsageLogs || []).filter(
-    (log) => log.batchId === batchId
-  );
+  const batchLogs = (appState.inventoryUsageLogs || [])
+    .concat(coldArchive["inventory-usage-logs"] || [])
+    .filter((log) => log.batchId === batchId);
 
   if (batchLogs.length === 0) return;
 
@@ -1236,24 +1365,22 @@ async function deleteBatchUsageLogs(batchId) {
   showLoading("Deleting batch logs...");
 
   try {
-    const deletePromises = batchLogs.map((log) =>
-      fetch(`${window.API_BASE_URL || ""}/api/inventory-usage-logs/${log.id}`, {
-        method: "DELETE",
-        credentials: "include",
-      })
+    await bulkArchiveAction(
+      "inventory-usage-logs",
+      "delete",
+      batchLogs.map((log) => log.id)
     );
 
-    const results = await Promise.all(deletePromises);
-    const allSuccess = results.every((res) => res.ok);
-
     hideLoading();
 
-    if (!allSuccess) throw new Error("Failed to delete some logs");
-
-    // Remove from appState
+    // Remove from appState and the cold archive
     appState.inventoryUsageLogs = (appState.inventoryUsageLogs || []).filter(
       (l) => l.batchId !== batchId
     );
+    takeColdRows(
+      "inventory-usage-logs",
+      batchLogs.map((log) => log.id)
+    );
 
     showAlert("Batch logs permanently deleted", "success");
     renderArchive();
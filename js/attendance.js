@@ -1022,8 +1022,11 @@ function updateAttendancePaginationControls(totalPages) {
 
   if (!currentPageEl || !totalPagesEl || !prevBtn || !nextBtn) return;
 
+  // Older logs the server has not sent yet add pages past the last one
+  const hasOlder = hasOlderStateRows("attendanceLogs");
+
   // Hide pagination if only one page or no logs
-  if (totalPages <= 1) {
+  if (totalPages <= 1 && !hasOlder) {
     pagination.style.display = "none";
     return;
   } else {
@@ -1031,11 +1034,11 @@ function updateAttendancePaginationControls(totalPages) {
   }
 
   currentPageEl.textContent = attendanceCurrentPage;
-  totalPagesEl.textContent = totalPages;
+  totalPagesEl.textContent = hasOlder ? `${totalPages}+` : totalPages;
 
   // Enable/disable buttons
   prevBtn.disabled = attendanceCurrentPage === 1;
-  nextBtn.disabled = attendanceCurrentPage >= totalPages;
+  nextBtn.disabled = attendanceCurrentPage >= totalPages && !hasOlder;
 }
 
 function attendancePreviousPage() {
@@ -1052,7 +1055,7 @@ function attendancePreviousPage() {
   }
 }
 
-function attendanceNextPage() {
+async function attendanceNextPage() {
   const statusFilterValue =
     document.getElementById("attendance-status-filter")?.value || "all";
 
@@ -1070,6 +1073,18 @@ function attendanceNextPage() {
   });
 
   const totalPages = Math.ceil(filteredLogs.length / attendanceItemsPerPage);
+  if (attendanceCurrentPage >= totalPages && hasOlderStateRows("attendanceLogs")) {
+    // On the last loaded page: fetch the next older logs, then try again
+    try {
+      await loadOlderStateRows("attendanceLogs");
+    } catch (error) {
+      console.error("Failed to load older attendance logs:", error);
+      showAlert("Failed to load older attendance logs", "error");
+      return;
+    }
+    attendanceNextPage();
+    return;
+  }
   if (attendanceCurrentPage < totalPages) {
     attendanceCurrentPage++;
     renderAttendance();
@@ -1080,6 +1095,9 @@ function attendanceNextPage() {
     if (logSection) {
       logSection.scrollIntoView({ behavior: "smooth", block: "start" });
     }
+  } else {
+    // The older logs ran out: redraw the controls without the extra page
+    renderAttendance();
   }
 }
 
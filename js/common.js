@@ -141,7 +141,174 @@ async function fetchServerState() {
     throw new Error(
       `Failed to fetch server state: ${res.status} ${res.statusText}`
     );
-  return res.json();
+  const state = await res.json();
+  serverStateCursor = state.cursor || null;
+  serverStateMore = state.more || {};
+  delete state.more;
+  return state;
+}
+
+// Cursor from the last /api/state response, used to fetch only what changed since
+let serverStateCursor = null;
+
+// /api/state sends only the most recent attendance logs and orders; state.more
+// holds the cursor for the next older page of each list it cut short, and the
+// list endpoint that page comes from
+let serverStateMore = {};
+const OLDER_ROWS_ENDPOINTS = {
+  attendanceLogs: "/api/attendance-logs",
+  orders: "/api/orders",
+};
+
+const STATE_LIST_KEYS = [
+  "users",
+  "attendanceLogs",
+  "inventory",
+  "orders",
+  "salesHistory",
+  "inventoryTrends",
+  "inventoryUsageLogs",
+  "requests",
+];
+
+function applyStateDelta(state, delta) {
+  // Drop deleted rows first, then upsert changed rows by id
+  Object.entries(delta.deleted || {}).forEach(([key, ids]) => {
+    const removed = new Set(ids.map(String));
+    state[key] = (state[key] || []).filter((row) => !removed.has(String(row.id)));
+  });
+  STATE_LIST_KEYS.forEach((key) => {
+    const rows = delta[key];
+    if (!rows || !rows.length) return;
+    const current = state[key] || [];
+    const indexById = new Map(current.map((row, i) => [String(row.id), i]));
+    rows.forEach((row) => {
+      const index = indexById.get(String(row.id));
+      if (index === undefined) {
+        current.unshift(row);
+      } else {
+        current[index] = row;
+      }
+    });
+    state[key] = current;
+  });
+  if (delta.attendanceTrend) state.attendanceTrend = delta.attendanceTrend;
+  return state;
+}
+
+async function refreshServerState() {
+  // Without a cursor there is nothing to diff against - load everything
+  if (!serverStateCursor) {
+    appState = await fetchServerState();
+    return appState;
+  }
+  const endpoint =
+    (typeof window !== "undefined" && window.APP_STATE_ENDPOINT) ||
+    "/api/state";
+  const res = await fetch(
+    `${endpoint}?since=${encodeURIComponent(serverStateCursor)}`,
+    { credentials: "include" }
+  );
+  // 410: the cursor is older than the deletions the server keeps, so a delta
+  // could leave deleted rows behind - load everything instead
+  if (res.status === 410) {
+    appState = await fetchServerState();
+    return appState;
+  }
+  if (!res.ok)
+    throw new Error(
+      `Failed to fetch state changes: ${res.status} ${res.statusText}`
+    );
+  const delta = await res.json();
+  serverStateCursor = delta.cursor || serverStateCursor;
+  applyStateDelta(appState, delta);
+  return appState;
+}
+
+// One page of a keyset-paged list endpoint; nextCursor (from X-Next-Cursor)
+// is null on the last page
+async function fetchPage(url, cursor = null) {
+  const pageUrl = cursor
+    ? `${url}${url.includes("?") ? "&" : "?"}cursor=${encodeURIComponent(cursor)}`
+    : url;
+  const res = await fetch(pageUrl, { credentials: "include" });
+  if (!res.ok)
+    throw new Error(`Failed to fetch ${url}: ${res.status} ${res.statusText}`);
+  return { rows: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
+// Whether the server has older rows of `key` than appState holds
+function hasOlderStateRows(key) {
+  return Boolean(serverStateMore[key]);
+}
+
+/**
+ * Add the next older page of `key` (attendanceLogs or orders) to appState
+ * @returns {number} how many rows were added
+ */
+async function loadOlderStateRows(key) {
+  const cursor = serverStateMore[key];
+  if (!cursor) return 0;
+  const { rows, nextCursor } = await fetchPage(
+    `${window.API_BASE_URL || ""}${OLDER_ROWS_ENDPOINTS[key]}`,
+    cursor
+  );
+  const known = new Set((appState[key] || []).map((row) => String(row.id)));
+  const older = rows.filter((row) => !known.has(String(row.id)));
+  appState[key] = (appState[key] || []).concat(older);
+  if (nextCursor) {
+    serverStateMore[key] = nextCursor;
+  } else {
+    delete serverStateMore[key];
+  }
+  return older.length;
+}
+
+// Live updates: the server pushes a "change" event per changed table over
+// /api/events (or "resync" after it missed some). Changes arriving close
+// together are folded into one delta fetch, then the page re-renders unless
+// the user is in the middle of typing or has a dialog open.
+let changeFeed = null;
+let changeRefreshTimer = null;
+const pendingChangeKeys = new Set();
+const CHANGE_REFRESH_DELAY_MS = 300;
+
+function startChangeFeed(page) {
+  if (changeFeed || typeof EventSource === "undefined" || !window.API_BASE_URL)
+    return;
+  changeFeed = new EventSource(`${window.API_BASE_URL}/api/events`);
+  changeFeed.addEventListener("change", (event) => {
+    const change = JSON.parse(event.data);
+    pendingChangeKeys.add(change.key);
+    scheduleChangeRefresh(page);
+  });
+  changeFeed.addEventListener("resync", () => {
+    STATE_LIST_KEYS.forEach((key) => pendingChangeKeys.add(key));
+    scheduleChangeRefresh(page);
+  });
+}
+
+function scheduleChangeRefresh(page) {
+  clearTimeout(changeRefreshTimer);
+  changeRefreshTimer = setTimeout(async () => {
+    const keys = [...pendingChangeKeys];
+    pendingChangeKeys.clear();
+    try {
+      await refreshServerState();
+    } catch (err) {
+      console.warn("Failed to apply live changes", err);
+      return;
+    }
+    window.dispatchEvent(
+      new CustomEvent("serverstatechange", { detail: { keys } })
+    );
+    const active = document.activeElement;
+    const editing =
+      active && ["INPUT", "TEXTAREA", "SELECT"].includes(active.tagName);
+    if (editing || document.querySelector(".modal-overlay")) return;
+    const renderers = window.pageRenderers || {};
+    if (typeof renderers[page] === "function") renderers[page]();
+  }, CHANGE_REFRESH_DELAY_MS);
 }
 
 const deepClone = (value) => JSON.parse(JSON.stringify(value));
@@ -1224,8 +1391,9 @@ function initApp() {
   }
 
   function bootPageFlow() {
-    // Recalculate sales history from served orders
-    if (typeof recalculateSalesHistory === "function") {
+    // The server rolls sales history up from orders; only rebuild it locally
+    // when running without one
+    if (!serverStateCursor && typeof recalculateSalesHistory === "function") {
       recalculateSalesHistory();
     }
 
@@ -1241,6 +1409,10 @@ function initApp() {
     updateSessionDisplay(user);
     applyRolePermissions(user);
 
+    if (serverStateCursor) {
+      flushPendingConsumes();
+    }
+
     // Check for clock-in prompt flag
     const shouldPromptClockIn = localStorage.getItem("show_clock_in_prompt");
     if (shouldPromptClockIn === "true") {
@@ -1260,6 +1432,9 @@ function initApp() {
     } catch (err) {
       console.warn("Error while rendering page", err);
     }
+
+    // Only with a server behind us: local-only mode has no one to hear from
+    if (serverStateCursor) startChangeFeed(page);
   }
 }
 
@@ -2071,6 +2246,148 @@ async function logConsolidatedIngredientUsage(items, reason, notes = "") {
   return createdLogs;
 }
 
+/**
+ * Deduct stock and record usage logs for a batch of items in one server
+ * transaction, then apply the new stock levels to appState.inventory
+ * @param {array} items - Array of {id, quantity, notes?}
+ * @param {string} reason - Reason for usage
+ * @param {object} options - {notes, clamp, batchId, createdBy, timestamp};
+ *   with clamp, stock stops at 0 instead of the whole batch being rejected
+ *   for a shortage. Resending a batchId the server has already recorded
+ *   deducts nothing
+ * @returns {object} {batchId, logIds, inventory}; throws with the server's
+ *   message on failure (409 lists the items that are short)
+ */
+async function consumeInventory(items, reason, options = {}) {
+  const batchId =
+    options.batchId ||
+    `batch-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`;
+  const apiBase = window.API_BASE_URL || "";
+  const response = await fetch(`${apiBase}/api/inventory/consume`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    credentials: "include",
+    body: JSON.stringify({
+      items: items.map((item) => ({
+        inventoryItemId: item.id,
+        quantity: parseFloat(item.quantity),
+        notes: item.notes || null,
+      })),
+      reason: reason,
+      notes: options.notes || null,
+      batchId: batchId,
+      createdBy: options.createdBy || getCurrentUser()?.id || null,
+      timestamp: options.timestamp || getLocalTimestamp(),
+      clamp: Boolean(options.clamp),
+    }),
+  });
+  const result = await response.json().catch(() => ({}));
+  if (!response.ok) {
+    const detail = result.detail || {};
+    const error = new Error(detail.message || `Failed to consume inventory: ${response.status}`);
+    error.status = response.status;
+    error.items = detail.items || [];
+    throw error;
+  }
+
+  (result.inventory || []).forEach((level) => {
+    const item = (appState.inventory || []).find((i) => i.id === level.id);
+    if (item) {
+      item.quantity = level.quantity;
+      item.totalUsed = level.totalUsed;
+    }
+  });
+  return result;
+}
+
+const PENDING_CONSUME_KEY = "cake_restaurant_pending_consumes";
+const PENDING_CONSUME_RETRY_MS = 30000;
+let pendingConsumeTimer = null;
+
+function loadPendingConsumes() {
+  try {
+    return JSON.parse(localStorage.getItem(PENDING_CONSUME_KEY)) || [];
+  } catch (e) {
+    return [];
+  }
+}
+
+function storePendingConsumes(queue) {
+  try {
+    if (queue.length > 0) {
+      localStorage.setItem(PENDING_CONSUME_KEY, JSON.stringify(queue));
+    } else {
+      localStorage.removeItem(PENDING_CONSUME_KEY);
+    }
+  } catch (e) {
+    console.warn("Unable to store pending inventory deductions", e);
+  }
+}
+
+/**
+ * Keep a consume that did not reach the server and resend it until it does.
+ * It keeps its batch id, so a resend of a batch the server did record is not
+ * deducted twice. The stock shown updates once the server has applied it
+ * @param {array} items - Array of {id, quantity, notes?}
+ * @param {string} reason - Reason for usage
+ * @param {object} options - Same as consumeInventory
+ */
+function queueInventoryConsume(items, reason, options = {}) {
+  const queue = loadPendingConsumes();
+  queue.push({
+    items,
+    reason,
+    options: {
+      ...options,
+      batchId:
+        options.batchId ||
+        `batch-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
+      createdBy: options.createdBy || getCurrentUser()?.id || null,
+      timestamp: options.timestamp || getLocalTimestamp(),
+    },
+  });
+  storePendingConsumes(queue);
+  schedulePendingConsumes();
+}
+
+function schedulePendingConsumes() {
+  if (pendingConsumeTimer) return;
+  pendingConsumeTimer = setTimeout(() => {
+    pendingConsumeTimer = null;
+    flushPendingConsumes();
+  }, PENDING_CONSUME_RETRY_MS);
+}
+
+/**
+ * Resend queued consumes in order. A request the server rejects (4xx) is
+ * dropped, since resending it cannot succeed; anything else stops the run
+ * and it is tried again later
+ */
+async function flushPendingConsumes() {
+  let queue = loadPendingConsumes();
+  while (queue.length > 0) {
+    const { items, reason, options } = queue[0];
+    try {
+      await consumeInventory(items, reason, options);
+    } catch (error) {
+      if (!error.status || error.status >= 500) {
+        schedulePendingConsumes();
+        return;
+      }
+      console.error(
+        `Dropping inventory deduction ${options.batchId} the server rejected:`,
+        error
+      );
+    }
+    queue = loadPendingConsumes().filter(
+      (entry) => entry.options.batchId !== options.batchId
+    );
+    storePendingConsumes(queue);
+  }
+}
+
+window.addEventListener("online", flushPendingConsumes);
+
 /**
  * Get all ingredient usage logs for a specific item
  * @param {string} inventoryItemId - ID of the inventory item
@@ -2201,6 +2518,8 @@ function getTrendingItemsByUsage(limit = 10, options = {}) {
 
 // Export functions globally
 window.logIngredientUsage = logIngredientUsage;
+window.consumeInventory = consumeInventory;
+window.queueInventoryConsume = queueInventoryConsume;
 window.getIngredientUsageLogs = getIngredientUsageLogs;
 window.getUsageByReason = getUsageByReason;
 window.getAllUsageLogs = getAllUsageLogs;
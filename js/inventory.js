@@ -12,6 +12,7 @@ const itemsPerPage = 20;
 
 // Usage logs pagination state
 let usageLogsCurrentPage = 1;
+let usageLogsTotalPages = 0;
 const usageLogsItemsPerPage = 20;
 
 function renderInventory() {
@@ -943,22 +944,19 @@ function setupRecordUsageButton() {
 
     console.log("Processing usage for items:", window.usageItems);
 
-    let successCount = 0;
-    const itemsToLog = []; // Collect items for consolidated log
-
-    // Process each item
+    // Check stock here for a per-item message; the server checks again with
+    // the rows locked, so a concurrent sale on another terminal still counts
+    const itemsToConsume = [];
     for (const { ingredientId, qty } of window.usageItems) {
-      const idx = appState.inventory.findIndex(
+      const item = appState.inventory.find(
         (i) => i.id === ingredientId && !i.archived
       );
 
-      if (idx < 0) {
+      if (!item) {
         showAlert(`Item ${ingredientId} not found or archived`, "error");
         continue;
       }
 
-      const item = appState.inventory[idx];
-
       if (item.quantity < qty) {
         showAlert(
           `Insufficient quantity for ${item.name}. Available: ${
@@ -969,59 +967,35 @@ function setupRecordUsageButton() {
         continue;
       }
 
-      // Deduct from inventory
-      item.quantity -= qty;
-
-      // Collect item info for consolidated log
-      itemsToLog.push({
-        id: ingredientId,
-        name: item.name,
-        quantity: qty,
-        unit: item.unit || "units",
-      });
-
-      // Update totalUsed
-      const currentTotalUsed = item.totalUsed || item.total_used || 0;
-      item.totalUsed = currentTotalUsed + qty;
+      itemsToConsume.push({ id: ingredientId, quantity: qty });
+    }
 
-      // Update inventory item in database
+    // Deduct stock and write one usage log per item (sharing a batch id) in
+    // a single request
+    let successCount = 0;
+    if (itemsToConsume.length > 0) {
+      showLoading("Recording usage logs...");
       try {
-        const apiBase = window.API_BASE_URL || "";
-        const response = await fetch(`${apiBase}/api/inventory/${item.id}`, {
-          method: "PUT",
-          headers: { "Content-Type": "application/json" },
-          credentials: "include",
-          body: JSON.stringify(item),
-        });
-
-        if (!response.ok) {
-          throw new Error("Failed to update inventory");
-        }
-
-        successCount++;
+        await consumeInventory(itemsToConsume, usageReason, { notes });
+        successCount = itemsToConsume.length;
       } catch (error) {
-        console.error("Error updating inventory:", error);
-        showAlert(`Failed to update ${item.name}. Please try again.`, "error");
+        console.error("Error recording usage:", error);
+        const shortages = (error.items || [])
+          .map((i) => `${i.name} (available: ${i.available})`)
+          .join(", ");
+        showAlert(
+          shortages
+            ? `Insufficient quantity for ${shortages}`
+            : "Failed to record usage. Please try again.",
+          error.status === 409 ? "warning" : "error"
+        );
       }
+      hideLoading();
     }
 
-    // Show loader
-    showLoading("Recording usage logs...");
-
-    // Create a single consolidated usage log for all items
-    if (
-      itemsToLog.length > 0 &&
-      typeof logConsolidatedIngredientUsage === "function"
-    ) {
-      await logConsolidatedIngredientUsage(itemsToLog, usageReason, notes);
-    }
-
-    // Hide loader
-    hideLoading();
-
     // Success
+    // consumeInventory has already applied the new stock levels
     if (successCount > 0) {
-      saveState();
       renderInventory();
       form.reset();
       window.usageItems = [];
@@ -1235,24 +1209,35 @@ function setupInventoryTabs() {
   });
 }
 
-// Load usage logs from database
+// Usage logs loaded so far, newest first, and the cursor for the next older
+// page (null once the oldest has been loaded)
+let usageLogRows = [];
+let usageLogsCursor = null;
+
+// Load the newest page of usage logs from the database; older pages load when
+// the user pages past them (usageLogsNextPage)
 async function loadUsageLogs() {
   try {
-    const response = await fetch(
-      `${window.API_BASE_URL || ""}/api/inventory-usage-logs`,
-      {
-        credentials: "include",
-      }
+    const { rows, nextCursor } = await fetchPage(
+      `${window.API_BASE_URL || ""}/api/inventory-usage-logs`
     );
-
-    if (!response.ok) throw new Error("Failed to fetch usage logs");
-
-    const logs = await response.json();
-    renderUsageLogs(logs);
+    usageLogRows = rows;
+    usageLogsCursor = nextCursor;
   } catch (error) {
     console.error("Error loading usage logs:", error);
-    renderUsageLogs([]);
+    usageLogRows = [];
+    usageLogsCursor = null;
   }
+  renderUsageLogs(usageLogRows);
+}
+
+async function loadOlderUsageLogs() {
+  const { rows, nextCursor } = await fetchPage(
+    `${window.API_BASE_URL || ""}/api/inventory-usage-logs`,
+    usageLogsCursor
+  );
+  usageLogRows = usageLogRows.concat(rows);
+  usageLogsCursor = nextCursor;
 }
 
 // Render usage logs table
@@ -1268,6 +1253,7 @@ function renderUsageLogs(logs) {
         </td>
       </tr>
     `;
+    usageLogsTotalPages = 0;
     updateUsageLogsPaginationControls(0);
     return;
   }
@@ -1406,6 +1392,8 @@ function renderUsageLogs(logs) {
 
   // Apply pagination
   const totalPages = Math.ceil(allRows.length / usageLogsItemsPerPage);
+  usageLogsTotalPages = totalPages;
+  usageLogsCurrentPage = Math.min(usageLogsCurrentPage, Math.max(totalPages, 1));
   const startIdx = (usageLogsCurrentPage - 1) * usageLogsItemsPerPage;
   const endIdx = startIdx + usageLogsItemsPerPage;
   const pageRows = allRows.slice(startIdx, endIdx);
@@ -1556,8 +1544,11 @@ function updateUsageLogsPaginationControls(totalPages) {
   if (!currentPageEl || !totalPagesEl || !prevBtn || !nextBtn || !pagination)
     return;
 
+  // Older logs not loaded yet add pages past the last one
+  const hasOlder = Boolean(usageLogsCursor);
+
   // Hide pagination if no pages or only one page
-  if (totalPages <= 1) {
+  if (totalPages <= 1 && !hasOlder) {
     pagination.style.display = "none";
     return;
   } else {
@@ -1565,23 +1556,36 @@ function updateUsageLogsPaginationControls(totalPages) {
   }
 
   currentPageEl.textContent = usageLogsCurrentPage;
-  totalPagesEl.textContent = totalPages;
+  totalPagesEl.textContent = hasOlder ? `${totalPages}+` : totalPages;
 
   // Enable/disable buttons
   prevBtn.disabled = usageLogsCurrentPage === 1;
-  nextBtn.disabled = usageLogsCurrentPage >= totalPages;
+  nextBtn.disabled = usageLogsCurrentPage >= totalPages && !hasOlder;
 }
 
 function usageLogsPreviousPage() {
   if (usageLogsCurrentPage > 1) {
     usageLogsCurrentPage--;
-    loadUsageLogs();
+    renderUsageLogs(usageLogRows);
   }
 }
 
-function usageLogsNextPage() {
-  usageLogsCurrentPage++;
-  loadUsageLogs();
+async function usageLogsNextPage() {
+  // On the last loaded page: fetch older logs until there is a next page
+  while (usageLogsCurrentPage >= usageLogsTotalPages && usageLogsCursor) {
+    try {
+      await loadOlderUsageLogs();
+    } catch (error) {
+      console.error("Error loading older usage logs:", error);
+      showAlert("Failed to load older usage logs", "error");
+      return;
+    }
+    renderUsageLogs(usageLogRows);
+  }
+  if (usageLogsCurrentPage < usageLogsTotalPages) {
+    usageLogsCurrentPage++;
+  }
+  renderUsageLogs(usageLogRows);
 }
 
 window.usageLogsPreviousPage = usageLogsPreviousPage;
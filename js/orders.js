@@ -499,26 +499,34 @@ async function processOrder(customer, orderType) {
     timestamp: getLocalTimestamp(),
   };
 
-  // Deduct from inventory
-  posCart.forEach((cartItem) => {
-    const invItem = appState.inventory.find((i) => i.id === cartItem.id);
-    if (invItem) {
-      invItem.quantity =
-        Number(invItem.quantity || 0) - Number(cartItem.qty || 0);
-      if (invItem.quantity < 0) invItem.quantity = 0;
-
-      // Log ingredient usage
-      if (typeof logIngredientUsage === "function") {
-        logIngredientUsage(
-          invItem.id,
-          Number(cartItem.qty),
-          "order",
-          order.id,
-          `Order item: ${cartItem.name}`
-        );
+  // Deduct the whole cart from inventory in one server transaction. The sale
+  // has already happened, so stock stops at zero instead of blocking it
+  const cartUsage = posCart
+    .filter((cartItem) => appState.inventory.some((i) => i.id === cartItem.id))
+    .map((cartItem) => ({
+      id: cartItem.id,
+      quantity: Number(cartItem.qty || 0),
+      notes: `Order item: ${cartItem.name}`,
+    }))
+    .filter((usage) => usage.quantity > 0);
+  if (cartUsage.length > 0) {
+    // One batch id for the first try and any resend, so the server can tell
+    // a resend of a deduction it already made
+    const consumeOptions = {
+      notes: `Order ${order.id}`,
+      clamp: true,
+      batchId: `batch-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
+    };
+    try {
+      await consumeInventory(cartUsage, "order", consumeOptions);
+    } catch (error) {
+      console.error("Failed to deduct inventory for order:", error);
+      // Resend the same deduction later rather than counting it down locally
+      if (!error.status || error.status >= 500) {
+        queueInventoryConsume(cartUsage, "order", consumeOptions);
       }
     }
-  });
+  }
 
   // Add order to appState
   appState.orders = appState.orders || [];
@@ -1430,8 +1438,11 @@ function updateOrdersPaginationControls(totalPages) {
   if (!currentPageEl || !totalPagesEl || !prevBtn || !nextBtn || !pagination)
     return;
 
+  // Older orders the server has not sent yet add pages past the last one
+  const hasOlder = hasOlderStateRows("orders");
+
   // Hide pagination if no pages or only one page
-  if (totalPages <= 1) {
+  if (totalPages <= 1 && !hasOlder) {
     pagination.style.display = "none";
     return;
   } else {
@@ -1439,11 +1450,11 @@ function updateOrdersPaginationControls(totalPages) {
   }
 
   currentPageEl.textContent = ordersCurrentPage;
-  totalPagesEl.textContent = totalPages;
+  totalPagesEl.textContent = hasOlder ? `${totalPages}+` : totalPages;
 
   // Enable/disable buttons
   prevBtn.disabled = ordersCurrentPage === 1;
-  nextBtn.disabled = ordersCurrentPage >= totalPages;
+  nextBtn.disabled = ordersCurrentPage >= totalPages && !hasOlder;
 }
 
 function ordersPreviousPage() {
@@ -1453,8 +1464,25 @@ function ordersPreviousPage() {
   }
 }
 
-function ordersNextPage() {
-  ordersCurrentPage++;
+async function ordersNextPage() {
+  const liveCount = () =>
+    (appState.orders || []).filter((order) => !order.archived).length;
+  // On the last loaded page: fetch older orders until there is a next page
+  while (
+    ordersCurrentPage * ordersItemsPerPage >= liveCount() &&
+    hasOlderStateRows("orders")
+  ) {
+    try {
+      await loadOlderStateRows("orders");
+    } catch (error) {
+      console.error("Failed to load older orders:", error);
+      showAlert("Failed to load older orders", "error");
+      return;
+    }
+  }
+  if (ordersCurrentPage * ordersItemsPerPage < liveCount()) {
+    ordersCurrentPage++;
+  }
   renderOrders();
 }
 
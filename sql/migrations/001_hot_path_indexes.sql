@@ -0,0 +1,37 @@
+-- 001: indexes for the hot read paths
+-- Partial indexes use "archived IS NOT TRUE", the same predicate the queries
+-- they serve use; Postgres only picks a partial index when the query's WHERE
+-- clause implies the index predicate.
+
+-- Attendance: export by employee and month, latest log per employee. Not
+-- partial, so it also backs the employee_id foreign key (cascading deletes).
+CREATE INDEX IF NOT EXISTS attendance_logs_employee_timestamp_idx
+  ON attendance_logs (employee_id, timestamp DESC);
+
+-- Attendance: export (newest first, optional month range), trend and analytics ranges
+CREATE INDEX IF NOT EXISTS attendance_logs_live_timestamp_idx
+  ON attendance_logs (timestamp DESC) WHERE archived IS NOT TRUE;
+
+-- Orders: export, analytics ranges and sales rollup rebuilds
+CREATE INDEX IF NOT EXISTS orders_live_timestamp_idx
+  ON orders (timestamp DESC) WHERE archived IS NOT TRUE;
+
+-- Usage logs: the paged list (newest first, unarchived only) and export
+CREATE INDEX IF NOT EXISTS inventory_usage_logs_live_created_at_id_idx
+  ON inventory_usage_logs (created_at DESC, id DESC) WHERE archived IS NOT TRUE;
+
+-- Usage logs: per-item history; also backs the inventory_item_id foreign key
+CREATE INDEX IF NOT EXISTS inventory_usage_logs_item_created_at_idx
+  ON inventory_usage_logs (inventory_item_id, created_at DESC);
+
+-- Requests: approved leave lookups for the attendance trend, and the employee_id foreign key
+CREATE INDEX IF NOT EXISTS requests_leave_dates_idx
+  ON requests (start_date, end_date) WHERE request_type = 'leave';
+CREATE INDEX IF NOT EXISTS requests_employee_idx
+  ON requests (employee_id);
+
+-- Inventory and users exports list unarchived rows in display order
+CREATE INDEX IF NOT EXISTS inventory_live_category_name_idx
+  ON inventory (category, name) WHERE archived IS NOT TRUE;
+CREATE INDEX IF NOT EXISTS users_live_name_idx
+  ON users (name) WHERE archived IS NOT TRUE;
@@ -0,0 +1,54 @@
+-- 002: change notifications for the live event stream (GET /api/events)
+-- Every write to a main table sends one NOTIFY on the table_changes channel per
+-- statement, not per row: {"table", "op", "count", "ids"}. ids lists the changed
+-- row ids, or is null when more than 50 rows changed (NOTIFY payloads are
+-- capped at 8000 bytes), which tells listeners to reload the whole table.
+-- Notifications are only delivered when the transaction commits.
+
+CREATE OR REPLACE FUNCTION notify_table_change() RETURNS trigger AS $$
+DECLARE
+  changed INT;
+  ids JSONB;
+BEGIN
+  IF TG_OP = 'TRUNCATE' THEN
+    changed := NULL;
+  ELSE
+    SELECT COUNT(*) INTO changed FROM changed_rows;
+    IF changed = 0 THEN
+      RETURN NULL;
+    END IF;
+    IF changed <= 50 THEN
+      SELECT jsonb_agg(id::text) INTO ids FROM changed_rows;
+    END IF;
+  END IF;
+  PERFORM pg_notify('table_changes', jsonb_build_object(
+    'table', TG_TABLE_NAME, 'op', lower(TG_OP), 'count', changed, 'ids', ids
+  )::text);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['users', 'attendance_logs', 'requests', 'inventory', 'inventory_usage_logs',
+                           'orders', 'sales_history', 'inventory_trends'] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_notify_insert', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()', t || '_notify_insert', t);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_notify_update', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING NEW TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()', t || '_notify_update', t);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_notify_delete', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()', t || '_notify_delete', t);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_notify_truncate', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER TRUNCATE ON %I
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()', t || '_notify_truncate', t);
+  END LOOP;
+END;
+$$;
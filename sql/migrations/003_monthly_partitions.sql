@@ -0,0 +1,189 @@
+-- 003: partition attendance_logs and orders by month on timestamp
+-- Both tables only grow, and almost every read is a timestamp range: an export
+-- for one month, a page of recent history, an analytics window. With one
+-- partition per month (attendance_logs_2026_10, orders_2026_10, ...) those
+-- reads only touch the months in range.
+--
+-- - The primary key becomes (id, timestamp): a unique index on a partitioned
+--   table has to include the partition key. Writes that may change a row's
+--   timestamp first move the row (see move_partition_key in the API), so an
+--   id still names one row.
+-- - <table>_default takes rows for months that have no partition yet.
+--   create_month_partitions() adds months ahead of time (the API runs it at
+--   startup and daily) and moves any rows for the new month out of the default.
+-- - detach_month_partitions() detaches old months. They stay behind as plain
+--   tables, out of every query on the parent.
+--
+-- The existing rows are copied into the new tables inside this migration's
+-- transaction, and both tables are locked until it commits.
+
+-- A row moved to another partition by an UPDATE fires the DELETE row triggers
+-- of its old partition. On a partition, record the tombstone under the
+-- partitioned table's name, and only if the id is really gone.
+CREATE OR REPLACE FUNCTION record_deleted_row() RETURNS trigger AS $$
+DECLARE
+  root TEXT := TG_TABLE_NAME;
+  still_there BOOLEAN;
+BEGIN
+  IF pg_partition_root(TG_RELID) IS NOT NULL THEN
+    SELECT relname INTO root FROM pg_class WHERE oid = pg_partition_root(TG_RELID);
+    EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE id = $1)', root) INTO still_there USING OLD.id;
+    IF still_there THEN
+      RETURN OLD;
+    END IF;
+  END IF;
+  INSERT INTO deleted_rows (table_name, row_id, deleted_at)
+  VALUES (root, OLD.id::text, clock_timestamp())
+  ON CONFLICT (table_name, row_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create the monthly partitions of `parent` from from_month through to_month
+-- that do not exist yet; returns how many were created
+CREATE OR REPLACE FUNCTION create_month_partitions(parent TEXT, from_month DATE, to_month DATE)
+RETURNS INT AS $$
+DECLARE
+  month DATE := date_trunc('month', from_month);
+  next_month DATE;
+  partition TEXT;
+  default_partition TEXT := parent || '_default';
+  in_default BOOLEAN;
+  created INT := 0;
+BEGIN
+  -- Two API instances starting together run this at the same time
+  PERFORM pg_advisory_xact_lock(hashtext('create_month_partitions'), hashtext(parent));
+  WHILE month <= to_month LOOP
+    next_month := month + INTERVAL '1 month';
+    partition := parent || '_' || to_char(month, 'YYYY_MM');
+    IF to_regclass(partition) IS NULL THEN
+      in_default := FALSE;
+      IF to_regclass(default_partition) IS NOT NULL THEN
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE timestamp >= $1 AND timestamp < $2)', default_partition)
+          INTO in_default USING month, next_month;
+      END IF;
+
+      IF NOT in_default THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                       partition, parent, month, next_month);
+      ELSE
+        -- A new partition cannot overlap rows in the default one: move them
+        -- over first. Moving goes around the parent, so the sales rollups and
+        -- change notifications do not see it; only the tombstones the delete
+        -- leaves need cleaning up.
+        EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition, parent);
+        EXECUTE format('WITH moved AS (DELETE FROM %I WHERE timestamp >= $1 AND timestamp < $2 RETURNING *)
+                        INSERT INTO %I SELECT * FROM moved', default_partition, partition)
+          USING month, next_month;
+        EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                       parent, partition, month, next_month);
+        EXECUTE format('DELETE FROM deleted_rows d USING %I p WHERE d.table_name = $1 AND d.row_id = p.id::text',
+                       partition) USING parent;
+      END IF;
+      created := created + 1;
+    END IF;
+    month := next_month;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach the monthly partitions of `parent` for months before before_month;
+-- returns the detached table names. Their rows leave the parent without
+-- firing delete triggers: sales rollups keep them and no tombstones are left.
+CREATE OR REPLACE FUNCTION detach_month_partitions(parent TEXT, before_month DATE)
+RETURNS SETOF TEXT AS $$
+DECLARE
+  partition TEXT;
+BEGIN
+  FOR partition IN
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = parent::regclass
+      AND c.relname ~ ('^' || parent || '_\d{4}_\d{2}$')
+      AND to_date(right(c.relname, 7), 'YYYY_MM') < date_trunc('month', before_month)
+    ORDER BY c.relname
+  LOOP
+    EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, partition);
+    RETURN NEXT partition;
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Swap each table for a partitioned copy with the same columns
+DO $$
+DECLARE
+  t TEXT;
+  first_month DATE;
+  last_month DATE;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['attendance_logs', 'orders'] LOOP
+    IF (SELECT relkind FROM pg_class WHERE oid = t::regclass) = 'p' THEN
+      CONTINUE;
+    END IF;
+    EXECUTE format('LOCK TABLE %I IN ACCESS EXCLUSIVE MODE', t);
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', t, t || '_unpartitioned');
+    EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (timestamp)',
+                   t, t || '_unpartitioned');
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', t || '_default', t);
+
+    -- Every month with data, and three months ahead
+    EXECUTE format('SELECT MIN(timestamp)::date, MAX(timestamp)::date FROM %I', t || '_unpartitioned')
+      INTO first_month, last_month;
+    PERFORM create_month_partitions(t, COALESCE(first_month, CURRENT_DATE),
+                                    GREATEST(last_month, (CURRENT_DATE + INTERVAL '3 months')::date));
+
+    -- No triggers on the new table yet, so the copy does not touch the rollups
+    EXECUTE format('INSERT INTO %I SELECT * FROM %I', t, t || '_unpartitioned');
+    EXECUTE format('DROP TABLE %I', t || '_unpartitioned');
+
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, timestamp)', t);
+    EXECUTE format('ALTER TABLE %I ADD FOREIGN KEY (archived_by) REFERENCES users(id) ON DELETE SET NULL', t);
+    EXECUTE format('CREATE INDEX %I ON %I (updated_at)', t || '_updated_at_idx', t);
+    EXECUTE format('CREATE INDEX %I ON %I (timestamp DESC, id DESC)', t || '_timestamp_id_idx', t);
+    EXECUTE format('CREATE INDEX %I ON %I (timestamp DESC) WHERE archived IS NOT TRUE', t || '_live_timestamp_idx', t);
+
+    -- Change tracking (schema.sql) and change notifications (002)
+    EXECUTE format('CREATE TRIGGER %I BEFORE UPDATE ON %I FOR EACH ROW
+                    WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION set_updated_at()',
+                   t || '_set_updated_at', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %I FOR EACH ROW EXECUTE FUNCTION record_deleted_row()',
+                   t || '_record_deleted_row', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I
+                    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()',
+                   t || '_bump_table_version', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()', t || '_notify_insert', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING NEW TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()', t || '_notify_update', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()', t || '_notify_delete', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER TRUNCATE ON %I
+                    FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()', t || '_notify_truncate', t);
+  END LOOP;
+END;
+$$;
+
+ALTER TABLE attendance_logs ADD FOREIGN KEY (employee_id) REFERENCES users(id) ON DELETE CASCADE;
+CREATE INDEX IF NOT EXISTS attendance_logs_employee_timestamp_idx ON attendance_logs (employee_id, timestamp DESC);
+
+-- Sales rollups (schema.sql)
+DROP TRIGGER IF EXISTS orders_sales_rollup_insert ON orders;
+CREATE TRIGGER orders_sales_rollup_insert AFTER INSERT ON orders
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION orders_sales_rollup();
+
+DROP TRIGGER IF EXISTS orders_sales_rollup_update ON orders;
+CREATE TRIGGER orders_sales_rollup_update AFTER UPDATE ON orders
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION orders_sales_rollup();
+
+DROP TRIGGER IF EXISTS orders_sales_rollup_delete ON orders;
+CREATE TRIGGER orders_sales_rollup_delete AFTER DELETE ON orders
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION orders_sales_rollup();
+
+DROP TRIGGER IF EXISTS orders_sales_rollup_truncate ON orders;
+CREATE TRIGGER orders_sales_rollup_truncate AFTER TRUNCATE ON orders
+  FOR EACH STATEMENT EXECUTE FUNCTION orders_sales_rollup();
@@ -0,0 +1,107 @@
+-- 004: cold archive tier for archived rows
+-- Archived users, inventory, attendance logs, usage logs and orders stay in
+-- the live tables, where every index carries them and every live query filters
+-- them out. move_to_cold_archive() moves rows archived before a cutoff into
+-- archive_<table>, a plain copy of the table plus moved_at; the API runs it
+-- daily (COLD_ARCHIVE_AFTER_DAYS). restore_from_cold_archive() moves rows
+-- back. A migration that adds a column to one of these tables must add it to
+-- its archive_ table as well.
+--
+-- Only rows nothing refers to are moved: deleting an archived user with
+-- attendance logs would cascade to the logs, and deleting one that archived
+-- or reviewed other rows would null out those references. Such rows stay live
+-- until everything pointing at them is gone from the live and the cold tables.
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['users', 'inventory', 'attendance_logs', 'inventory_usage_logs', 'orders'] LOOP
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I (LIKE %I)', 'archive_' || t, t);
+    EXECUTE format('ALTER TABLE %I ADD COLUMN IF NOT EXISTS moved_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP',
+                   'archive_' || t);
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conrelid = ('archive_' || t)::regclass AND contype = 'p') THEN
+      EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id)', 'archive_' || t);
+    END IF;
+    -- GET /api/archive/{type} pages newest first on (moved_at, id)
+    EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I (moved_at DESC, id DESC)',
+                   'archive_' || t || '_moved_at_id_idx', 'archive_' || t);
+  END LOOP;
+END;
+$$;
+
+-- Columns of archive_<tbl> shared with the live table, as a quoted list
+CREATE OR REPLACE FUNCTION cold_archive_columns(tbl TEXT) RETURNS TEXT AS $$
+  SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum)
+  FROM pg_attribute
+  WHERE attrelid = ('archive_' || tbl)::regclass AND attnum > 0 AND NOT attisdropped AND attname <> 'moved_at';
+$$ LANGUAGE sql STABLE;
+
+-- Move up to max_rows rows of `tbl` archived before `cutoff` (archived_at, or
+-- updated_at for rows archived without a stamp) into archive_<tbl>; returns
+-- how many moved. Leaving the live table counts as a delete for incremental
+-- sync and the change feed; the sales rollups already exclude archived orders.
+CREATE OR REPLACE FUNCTION move_to_cold_archive(tbl TEXT, cutoff TIMESTAMP, max_rows INT) RETURNS INT AS $$
+DECLARE
+  cols TEXT := cold_archive_columns(tbl);
+  updates TEXT;
+  unreferenced TEXT := '';
+  ref RECORD;
+  moved INT;
+BEGIN
+  SELECT string_agg(format('%I = EXCLUDED.%I', attname, attname), ', ' ORDER BY attnum) INTO updates
+  FROM pg_attribute
+  WHERE attrelid = ('archive_' || tbl)::regclass AND attnum > 0 AND NOT attisdropped AND attname <> 'moved_at';
+
+  FOR ref IN
+    SELECT child.relname AS child, a.attname AS col
+    FROM pg_constraint c
+    JOIN pg_class child ON child.oid = c.conrelid
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+    WHERE c.contype = 'f' AND c.confrelid = tbl::regclass AND c.conparentid = 0
+  LOOP
+    unreferenced := unreferenced || format(' AND NOT EXISTS (SELECT 1 FROM %I r WHERE r.%I = t.id)', ref.child, ref.col);
+    IF to_regclass('archive_' || ref.child) IS NOT NULL THEN
+      unreferenced := unreferenced
+        || format(' AND NOT EXISTS (SELECT 1 FROM %I r WHERE r.%I = t.id)', 'archive_' || ref.child, ref.col);
+    END IF;
+  END LOOP;
+
+  EXECUTE format(
+    'WITH moved AS (
+       DELETE FROM %1$I WHERE id IN (
+         SELECT t.id FROM %1$I t
+         WHERE t.archived IS TRUE AND COALESCE(t.archived_at, t.updated_at) < $1 %2$s
+         LIMIT $2)
+       RETURNING %3$s)
+     INSERT INTO %4$I (%3$s) SELECT %3$s FROM moved
+     ON CONFLICT (id) DO UPDATE SET %5$s, moved_at = CURRENT_TIMESTAMP',
+    tbl, unreferenced, cols, 'archive_' || tbl, updates
+  ) USING cutoff, max_rows;
+  GET DIAGNOSTICS moved = ROW_COUNT;
+  RETURN moved;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move the rows of archive_<tbl> with these ids back into `tbl`, still
+-- archived; returns how many were restored. An id that is live again already
+-- keeps its live row.
+CREATE OR REPLACE FUNCTION restore_from_cold_archive(tbl TEXT, ids TEXT[]) RETURNS INT AS $$
+DECLARE
+  cols TEXT := cold_archive_columns(tbl);
+  id_type TEXT;
+  restored INT;
+BEGIN
+  SELECT format_type(atttypid, atttypmod) INTO id_type
+  FROM pg_attribute WHERE attrelid = ('archive_' || tbl)::regclass AND attname = 'id';
+
+  EXECUTE format(
+    'WITH restored AS (DELETE FROM %1$I WHERE id = ANY($1::%2$s[]) RETURNING %3$s)
+     INSERT INTO %4$I (%3$s) SELECT %3$s FROM restored
+     ON CONFLICT DO NOTHING',
+    'archive_' || tbl, id_type, cols, tbl
+  ) USING ids;
+  GET DIAGNOSTICS restored = ROW_COUNT;
+  RETURN restored;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,18 @@
+-- 005: stamp new rows with the time they are written
+-- updated_at defaulted to CURRENT_TIMESTAMP, the start of the inserting
+-- transaction, while updates are stamped with clock_timestamp(). Rows inserted
+-- late in a long transaction (a large POST /api/state) could then carry a
+-- stamp older than a sync cursor handed out before they were written, and a
+-- delta sync would never send them. The API now also holds the cursor at the
+-- start of the oldest transaction still writing (fetch_sync_point).
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['users', 'attendance_logs', 'requests', 'inventory', 'inventory_usage_logs',
+                           'orders', 'sales_history', 'inventory_trends'] LOOP
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN updated_at SET DEFAULT clock_timestamp()', t);
+  END LOOP;
+END;
+$$;
@@ -0,0 +1,40 @@
+-- 006: table versions without a shared counter row
+-- bump_table_version() used to increment table_versions.version in place. That
+-- row stayed locked until the writing transaction committed, so every writer
+-- to a table waited for the one before it (a long POST /api/state held up
+-- every clock-in), and transactions touching tables in different orders (a
+-- cascading user delete against a save) could deadlock.
+--
+-- Writers now insert one row per transaction and table into
+-- table_version_log, which never waits on another transaction. A table's
+-- version is table_versions.version plus its log rows, so it still moves only
+-- when a write commits. fold_table_versions() adds the log into table_versions
+-- and empties it; the API runs it every minute.
+
+CREATE TABLE IF NOT EXISTS table_version_log (
+  table_name VARCHAR(64) NOT NULL,
+  txid BIGINT NOT NULL,
+  PRIMARY KEY (table_name, txid)
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO table_version_log (table_name, txid) VALUES (TG_TABLE_NAME, txid_current())
+  ON CONFLICT DO NOTHING;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move committed log rows into table_versions; returns how many were folded.
+-- One statement, so a reader sees the rows either in the log or in the counters.
+CREATE OR REPLACE FUNCTION fold_table_versions() RETURNS INT AS $$
+  WITH folded AS (
+    DELETE FROM table_version_log RETURNING table_name
+  ), counts AS (
+    INSERT INTO table_versions (table_name, version)
+    SELECT table_name, COUNT(*) FROM folded GROUP BY table_name
+    ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + EXCLUDED.version
+    RETURNING version
+  )
+  SELECT COUNT(*)::int FROM folded;
+$$ LANGUAGE sql;
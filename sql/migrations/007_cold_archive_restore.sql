@@ -0,0 +1,33 @@
+-- 007: restore cold archived rows without losing any
+-- restore_from_cold_archive() (migration 004) deleted the rows from
+-- archive_<tbl> and re-inserted them with ON CONFLICT DO NOTHING, so a row
+-- that hit a unique constraint (its id live again, or a live user who has
+-- since taken the same email) was dropped from both tables without an error.
+
+-- Move the rows of archive_<tbl> with these ids back into `tbl`, still
+-- archived; returns how many were restored. A row is only removed from the
+-- archive once it is back in `tbl`: an id that is live again keeps its live
+-- row and its archived copy, and any other conflict raises instead of
+-- dropping the row.
+CREATE OR REPLACE FUNCTION restore_from_cold_archive(tbl TEXT, ids TEXT[]) RETURNS INT AS $$
+DECLARE
+  cols TEXT := cold_archive_columns(tbl);
+  id_type TEXT;
+  restored INT;
+BEGIN
+  SELECT format_type(atttypid, atttypmod) INTO id_type
+  FROM pg_attribute WHERE attrelid = ('archive_' || tbl)::regclass AND attname = 'id';
+
+  EXECUTE format(
+    'WITH restored AS (
+       INSERT INTO %1$I (%3$s)
+       SELECT %3$s FROM %2$I a
+       WHERE a.id = ANY($1::%4$s[]) AND NOT EXISTS (SELECT 1 FROM %1$I t WHERE t.id = a.id)
+       RETURNING id)
+     DELETE FROM %2$I WHERE id IN (SELECT id FROM restored)',
+    tbl, 'archive_' || tbl, cols, id_type
+  ) USING ids;
+  GET DIAGNOSTICS restored = ROW_COUNT;
+  RETURN restored;
+END;
+$$ LANGUAGE plpgsql;
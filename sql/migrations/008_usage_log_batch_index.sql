@@ -0,0 +1,6 @@
+-- 008: look up usage logs by batch
+-- POST /api/inventory/consume treats a batch_id it has already recorded as a
+-- retry and deducts nothing, so a terminal can resend a consume whose
+-- response it never got. The lookup runs inside the consume transaction.
+CREATE INDEX IF NOT EXISTS inventory_usage_logs_batch_id_idx
+  ON inventory_usage_logs (batch_id) WHERE batch_id IS NOT NULL;
@@ -0,0 +1,73 @@
+-- 009: one row per id in attendance_logs and orders
+-- Since migration 003 the primary key of both tables is (id, timestamp), so a
+-- second row with an existing id and another timestamp was inserted instead
+-- of failing. The cold archive (PRIMARY KEY (id)) then could not take both.
+--
+-- partitioned_row_ids holds every id of the two tables, kept by statement
+-- triggers on the parents: an insert adds its ids, so a repeated id fails
+-- with a unique violation; a delete or truncate removes them. A row moved to
+-- another month by an UPDATE keeps its id and entry. move_partition_key in
+-- the API locks the entries of the ids it writes before moving rows.
+--
+-- Rows of a detached month leave the parent without firing triggers, so their
+-- ids stay taken.
+
+CREATE TABLE IF NOT EXISTS partitioned_row_ids (
+  table_name TEXT NOT NULL,
+  id VARCHAR(64) NOT NULL,
+  PRIMARY KEY (table_name, id)
+);
+
+CREATE OR REPLACE FUNCTION track_partitioned_row_ids() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO partitioned_row_ids (table_name, id) SELECT TG_TABLE_NAME, id FROM new_rows;
+  ELSIF TG_OP = 'DELETE' THEN
+    DELETE FROM partitioned_row_ids r USING old_rows o WHERE r.table_name = TG_TABLE_NAME AND r.id = o.id;
+  ELSE
+    DELETE FROM partitioned_row_ids WHERE table_name = TG_TABLE_NAME;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- The entries are keyed by id, so an id never changes; the API never does it
+CREATE OR REPLACE FUNCTION reject_id_change() RETURNS trigger AS $$
+BEGIN
+  RAISE EXCEPTION 'row ids cannot change (% to %)', OLD.id, NEW.id;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+  t TEXT;
+  removed INT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['attendance_logs', 'orders'] LOOP
+    EXECUTE format('LOCK TABLE %I IN SHARE ROW EXCLUSIVE MODE', t);
+
+    -- Ids already repeated: keep the copy written last, which is the one the
+    -- client meant to move there
+    EXECUTE format(
+      'DELETE FROM %1$I r USING (
+         SELECT id, timestamp, row_number() OVER (PARTITION BY id ORDER BY updated_at DESC NULLS LAST, timestamp DESC) AS n
+         FROM %1$I) d
+       WHERE r.id = d.id AND r.timestamp = d.timestamp AND d.n > 1', t);
+    GET DIAGNOSTICS removed = ROW_COUNT;
+    IF removed > 0 THEN
+      RAISE WARNING 'removed % older row(s) of % that repeated an id', removed, t;
+    END IF;
+
+    EXECUTE format('INSERT INTO partitioned_row_ids (table_name, id) SELECT %L, id FROM %I ON CONFLICT DO NOTHING', t, t);
+
+    EXECUTE format('CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION track_partitioned_row_ids()', t || '_track_ids_insert', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION track_partitioned_row_ids()', t || '_track_ids_delete', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER TRUNCATE ON %I
+                    FOR EACH STATEMENT EXECUTE FUNCTION track_partitioned_row_ids()', t || '_track_ids_truncate', t);
+    EXECUTE format('CREATE TRIGGER %I BEFORE UPDATE OF id ON %I FOR EACH ROW
+                    WHEN (OLD.id IS DISTINCT FROM NEW.id) EXECUTE FUNCTION reject_id_change()', t || '_reject_id_change', t);
+  END LOOP;
+END;
+$$;
@@ -57,4 +57,15 @@ ORDER BY name;
 -- 10) Inventory value summary
 SELECT SUM(quantity * cost) AS inventory_value FROM inventory;
 
+-- 11) Top-selling items in a date range (GET /api/analytics/summary)
+SELECT item->>'name' AS name, SUM((item->>'qty')::numeric) AS quantity
+FROM orders o
+CROSS JOIN LATERAL jsonb_array_elements(o.items_json) AS item
+WHERE o.archived = false
+  AND jsonb_typeof(o.items_json) = 'array'
+  AND o.timestamp >= $1 AND o.timestamp < $2::date + 1 -- $1/$2 = first/last day
+GROUP BY 1
+ORDER BY quantity DESC
+LIMIT 5;
+
 -- End of queries
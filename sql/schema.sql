@@ -129,3 +129,248 @@ CREATE TABLE IF NOT EXISTS inventory_trends (
   used INT DEFAULT 0
 );
 
+
+-- Change tracking for incremental sync (GET /api/state?since=<cursor>) and ETags
+-- Every table gets an updated_at column: inserts take the column default and
+-- updates that actually change the row bump it through a trigger. Deleted rows
+-- leave a tombstone in deleted_rows so clients can drop them from their cache.
+CREATE TABLE IF NOT EXISTS deleted_rows (
+  table_name VARCHAR(64) NOT NULL,
+  row_id VARCHAR(64) NOT NULL,
+  deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (table_name, row_id)
+);
+
+CREATE INDEX IF NOT EXISTS deleted_rows_deleted_at_idx ON deleted_rows (deleted_at);
+
+-- One change counter per table, moved by every writing transaction. Endpoints
+-- derive their ETag from these counters without reading the data itself. A
+-- table's version is table_versions.version plus its rows in
+-- table_version_log: writers only insert log rows, so they never wait on each
+-- other, and fold_table_versions() (migration 006) adds the log into the counters.
+CREATE TABLE IF NOT EXISTS table_versions (
+  table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS table_version_log (
+  table_name VARCHAR(64) NOT NULL,
+  txid BIGINT NOT NULL,
+  PRIMARY KEY (table_name, txid)
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO table_version_log (table_name, txid) VALUES (TG_TABLE_NAME, txid_current())
+  ON CONFLICT DO NOTHING;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+  NEW.updated_at := clock_timestamp();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- On a partition (migration 003), the tombstone is recorded under the
+-- partitioned table's name, and not for rows an UPDATE moved to another partition
+CREATE OR REPLACE FUNCTION record_deleted_row() RETURNS trigger AS $$
+DECLARE
+  root TEXT := TG_TABLE_NAME;
+  still_there BOOLEAN;
+BEGIN
+  IF pg_partition_root(TG_RELID) IS NOT NULL THEN
+    SELECT relname INTO root FROM pg_class WHERE oid = pg_partition_root(TG_RELID);
+    EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE id = $1)', root) INTO still_there USING OLD.id;
+    IF still_there THEN
+      RETURN OLD;
+    END IF;
+  END IF;
+  INSERT INTO deleted_rows (table_name, row_id, deleted_at)
+  VALUES (root, OLD.id::text, clock_timestamp())
+  ON CONFLICT (table_name, row_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['users', 'attendance_logs', 'requests', 'inventory', 'inventory_usage_logs',
+                           'orders', 'sales_history', 'inventory_trends'] LOOP
+    EXECUTE format('ALTER TABLE %I ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT clock_timestamp()', t);
+    EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I (updated_at)', t || '_updated_at_idx', t);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_set_updated_at', t);
+    EXECUTE format('CREATE TRIGGER %I BEFORE UPDATE ON %I FOR EACH ROW
+                    WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION set_updated_at()',
+                   t || '_set_updated_at', t);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_record_deleted_row', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %I FOR EACH ROW EXECUTE FUNCTION record_deleted_row()',
+                   t || '_record_deleted_row', t);
+
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_bump_table_version', t);
+    EXECUTE format('CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I
+                    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()',
+                   t || '_bump_table_version', t);
+  END LOOP;
+END;
+$$;
+
+-- Keyset pagination: history lists are paged newest first on (timestamp, id),
+-- so each page is a range scan on one of these indexes
+CREATE INDEX IF NOT EXISTS attendance_logs_timestamp_id_idx ON attendance_logs (timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS orders_timestamp_id_idx ON orders (timestamp DESC, id DESC);
+-- (created_at, id) is a page key, so it must never be NULL
+UPDATE inventory_usage_logs SET created_at = updated_at WHERE created_at IS NULL;
+ALTER TABLE inventory_usage_logs ALTER COLUMN created_at SET NOT NULL;
+CREATE INDEX IF NOT EXISTS inventory_usage_logs_created_at_id_idx ON inventory_usage_logs (created_at DESC, id DESC);
+
+-- Sales rollups, maintained by the server from orders
+-- sales_history (one row per day) and sales_history_hourly (one row per hour)
+-- hold the total and count of non-archived orders. Statement-level triggers on
+-- orders fold each write into them as one grouped upsert. Inserting, editing,
+-- archiving, restoring and deleting orders all move the totals. Days or hours
+-- left with no orders are removed. rebuild_sales_rollups(from, to) recomputes
+-- a date range from scratch; see backend/rebuild_sales.py.
+CREATE TABLE IF NOT EXISTS sales_history_hourly (
+  hour TIMESTAMP NOT NULL PRIMARY KEY,
+  total NUMERIC(14,2) NOT NULL DEFAULT 0,
+  orders_count INT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION apply_sales_deltas(order_times TIMESTAMP[], amounts NUMERIC[], counts INT[])
+RETURNS void AS $$
+BEGIN
+  IF order_times IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO sales_history (id, date, total, orders_count)
+  SELECT 'sale-' || to_char(d.at::date, 'YYYY-MM-DD'), d.at::date, SUM(d.amount), SUM(d.n)
+  FROM unnest(order_times, amounts, counts) AS d(at, amount, n)
+  GROUP BY d.at::date
+  HAVING SUM(d.amount) <> 0 OR SUM(d.n) <> 0
+  ON CONFLICT (date) DO UPDATE SET
+    total = COALESCE(sales_history.total, 0) + EXCLUDED.total,
+    orders_count = COALESCE(sales_history.orders_count, 0) + EXCLUDED.orders_count;
+
+  INSERT INTO sales_history_hourly (hour, total, orders_count)
+  SELECT date_trunc('hour', d.at), SUM(d.amount), SUM(d.n)
+  FROM unnest(order_times, amounts, counts) AS d(at, amount, n)
+  GROUP BY date_trunc('hour', d.at)
+  HAVING SUM(d.amount) <> 0 OR SUM(d.n) <> 0
+  ON CONFLICT (hour) DO UPDATE SET
+    total = sales_history_hourly.total + EXCLUDED.total,
+    orders_count = sales_history_hourly.orders_count + EXCLUDED.orders_count;
+
+  DELETE FROM sales_history
+  WHERE orders_count <= 0 AND date IN (SELECT DISTINCT t::date FROM unnest(order_times) AS t);
+  DELETE FROM sales_history_hourly
+  WHERE orders_count <= 0 AND hour IN (SELECT DISTINCT date_trunc('hour', t) FROM unnest(order_times) AS t);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION orders_sales_rollup() RETURNS trigger AS $$
+DECLARE
+  order_times TIMESTAMP[];
+  amounts NUMERIC[];
+  counts INT[];
+BEGIN
+  IF TG_OP = 'TRUNCATE' THEN
+    DELETE FROM sales_history;
+    DELETE FROM sales_history_hourly;
+    RETURN NULL;
+  ELSIF TG_OP = 'INSERT' THEN
+    SELECT array_agg(timestamp), array_agg(COALESCE(total, 0)), array_agg(1)
+    INTO order_times, amounts, counts
+    FROM new_rows WHERE archived IS NOT TRUE;
+  ELSIF TG_OP = 'DELETE' THEN
+    SELECT array_agg(timestamp), array_agg(-COALESCE(total, 0)), array_agg(-1)
+    INTO order_times, amounts, counts
+    FROM old_rows WHERE archived IS NOT TRUE;
+  ELSE
+    -- Add the new versions and take back the old ones; rows whose timestamp,
+    -- total and archived flag did not change cancel out
+    SELECT array_agg(d.at), array_agg(d.amount), array_agg(d.n)
+    INTO order_times, amounts, counts
+    FROM (
+      SELECT timestamp AS at, COALESCE(total, 0) AS amount, 1 AS n FROM new_rows WHERE archived IS NOT TRUE
+      UNION ALL
+      SELECT timestamp, -COALESCE(total, 0), -1 FROM old_rows WHERE archived IS NOT TRUE
+    ) AS d;
+  END IF;
+
+  PERFORM apply_sales_deltas(order_times, amounts, counts);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rebuild_sales_rollups(from_date DATE, to_date DATE) RETURNS INT AS $$
+DECLARE
+  rebuilt INT;
+BEGIN
+  -- Hold off order writes until the range is recomputed
+  LOCK TABLE orders IN SHARE MODE;
+
+  DELETE FROM sales_history WHERE date BETWEEN from_date AND to_date;
+  DELETE FROM sales_history_hourly WHERE hour >= from_date AND hour < to_date + 1;
+
+  INSERT INTO sales_history (id, date, total, orders_count)
+  SELECT 'sale-' || to_char(timestamp::date, 'YYYY-MM-DD'), timestamp::date, SUM(COALESCE(total, 0)), COUNT(*)
+  FROM orders
+  WHERE archived IS NOT TRUE AND timestamp >= from_date AND timestamp < to_date + 1
+  GROUP BY timestamp::date;
+  GET DIAGNOSTICS rebuilt = ROW_COUNT;
+
+  INSERT INTO sales_history_hourly (hour, total, orders_count)
+  SELECT date_trunc('hour', timestamp), SUM(COALESCE(total, 0)), COUNT(*)
+  FROM orders
+  WHERE archived IS NOT TRUE AND timestamp >= from_date AND timestamp < to_date + 1
+  GROUP BY date_trunc('hour', timestamp);
+
+  RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql;
+
+-- First run: sales_history used to hold whatever the browser saved, with one
+-- row per client-generated id. Replace it with rollups derived from orders and
+-- key it by date.
+DO $$
+DECLARE
+  first_day DATE;
+  last_day DATE;
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE indexname = 'sales_history_date_key') THEN
+    DELETE FROM sales_history;
+    CREATE UNIQUE INDEX sales_history_date_key ON sales_history (date);
+    SELECT MIN(timestamp)::date, MAX(timestamp)::date INTO first_day, last_day FROM orders;
+    IF first_day IS NOT NULL THEN
+      PERFORM rebuild_sales_rollups(first_day, last_day);
+    END IF;
+  END IF;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS orders_sales_rollup_insert ON orders;
+CREATE TRIGGER orders_sales_rollup_insert AFTER INSERT ON orders
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION orders_sales_rollup();
+
+DROP TRIGGER IF EXISTS orders_sales_rollup_update ON orders;
+CREATE TRIGGER orders_sales_rollup_update AFTER UPDATE ON orders
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION orders_sales_rollup();
+
+DROP TRIGGER IF EXISTS orders_sales_rollup_delete ON orders;
+CREATE TRIGGER orders_sales_rollup_delete AFTER DELETE ON orders
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION orders_sales_rollup();
+
+DROP TRIGGER IF EXISTS orders_sales_rollup_truncate ON orders;
+CREATE TRIGGER orders_sales_rollup_truncate AFTER TRUNCATE ON orders
+  FOR EACH STATEMENT EXECUTE FUNCTION orders_sales_rollup();